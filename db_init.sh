@@ -3,19 +3,10 @@
 echo "Removing database..."
 rm -f db.sqlite3
 
-echo "Removing old migrations..."
-find users/migrations -name "*.py" -not -name "__init__.py" -delete
-find groups/migrations -name "*.py" -not -name "__init__.py" -delete
-
-echo "Making new migrations..."
-python3 manage.py makemigrations users
-python3 manage.py makemigrations groups
-
 echo "Applying migrations..."
-python3 manage.py migrate auth
-python3 manage.py migrate users  # Apply users migrations first
-python3 manage.py migrate groups  # Then groups
-python3 manage.py migrate  # Finally any remaining migrations
+# The committed migrations include hand-written ones (search indexes, ledger
+# backfill) that makemigrations can't regenerate, so apply them as they are
+python3 manage.py migrate
 
 echo "Collecting static files..."
 python3 manage.py collectstatic --noinput
@@ -79,6 +70,9 @@ Notification.objects.create(
 print("Database setup complete!")
 END
 
+echo "Recording seeded points in the ledger..."
+python3 manage.py reconcile_points --fix
+
 echo "Database reset complete!"
 echo "You can now login with:"
 echo "Admin interface (http://localhost:8000/admin):"
@@ -0,0 +1,18 @@
+from .models import GroupActivity
+
+def record(group_id, kind, actor_id=None, bet_id=None, points=None):
+    GroupActivity.objects.create(group_id=group_id, kind=kind, actor_id=actor_id, bet_id=bet_id, points=points)
+
+def record_many(entries):
+    """Bulk insert (group_id, kind, actor_id, bet_id, points) tuples"""
+    GroupActivity.objects.bulk_create([
+        GroupActivity(group_id=group_id, kind=kind, actor_id=actor_id, bet_id=bet_id, points=points)
+        for group_id, kind, actor_id, bet_id, points in entries
+    ], batch_size=1000)
+
+def record_joins(group_id, user_ids):
+    record_many((group_id, 'member_joined', user_id, None, None) for user_id in user_ids)
+
+def record_settlements(bets):
+    """One entry per settled bet, given (bet_id, group_id) pairs"""
+    record_many((group_id, 'bet_settled', None, bet_id, None) for bet_id, group_id in bets)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import BettingGroup, Bet, UserBet, GroupInvite
+from .models import BettingGroup, Bet, UserBet, GroupInvite, SportSnapshot
 
 class BettingGroupAdmin(admin.ModelAdmin):
     list_display = ('name', 'sports', 'president', 'created_at')
@@ -16,7 +16,11 @@ class UserBetAdmin(admin.ModelAdmin):
     list_filter = ('choice',)
     search_fields = ('user__username',)
 
+class SportSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('sport', 'version', 'event_count', 'refreshed_at', 'last_attempt_at', 'last_error')
+
 admin.site.register(BettingGroup, BettingGroupAdmin)
 admin.site.register(Bet, BetAdmin)
 admin.site.register(UserBet, UserBetAdmin)
-admin.site.register(GroupInvite) 
\ No newline at end of file
+admin.site.register(GroupInvite)
+admin.site.register(SportSnapshot, SportSnapshotAdmin) 
\ No newline at end of file
@@ -0,0 +1,140 @@
+from django.db import transaction
+from django.utils import timezone
+from .models import Bet, BettingGroup, Event, Market
+from . import activity
+
+DEFAULT_SUBMARKET = 'period=ft'
+
+# Cloudbet markets whose bets compute_results can settle, and the Bet.type for
+# each. Moneylines are only two-way markets: soccer.match_odds has a draw,
+# which would settle as a push, so it isn't offered.
+SUPPORTED_MARKETS = {
+    'american_football.moneyline': 'moneyline',
+    'american_football.handicap': 'spread',
+    'american_football.totals': 'over/under',
+    'basketball.moneyline': 'moneyline',
+    'basketball.handicap': 'spread',
+    'basketball.totals': 'over/under',
+    'baseball.moneyline': 'moneyline',
+    'baseball.run_line': 'spread',
+    'baseball.totals': 'over/under',
+    'ice_hockey.winner': 'moneyline',  # Includes overtime and shootout, so no draw
+    'ice_hockey.handicap': 'spread',
+    'ice_hockey.totals': 'over/under',
+    'soccer.asian_handicap': 'spread',
+    'soccer.total_goals': 'over/under',
+}
+
+def bet_type_for(market_key):
+    """Bet.type for a supported Cloudbet market key, otherwise None"""
+    return SUPPORTED_MARKETS.get(market_key)
+
+def parse_line(params):
+    """Numeric line from selection params such as 'handicap=-1.5' or 'total=2.5'"""
+    for part in (params or '').split('&'):
+        key, _, value = part.partition('=')
+        if key in ('handicap', 'total'):
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+def import_bets(group, items, actor_id=None):
+    """Create Bets for a group from Cloudbet markets in the local odds store.
+
+    items are dicts with event_id, market and optionally submarket (defaults
+    to the full-time period) and params (the line; defaults to the line
+    priced closest to evens). Only SUPPORTED_MARKETS with a usable line are
+    imported; anything else is reported in errors. Markets the group
+    already imported are skipped before anything is written, so a re-import
+    is a no-op; imports into the same group run one at a time. Returns
+    (created bets, skipped items, errors).
+    """
+    event_ids = {item['event_id'] for item in items}
+    events = {e.cloudbet_id: e for e in Event.objects.filter(cloudbet_id__in=event_ids)}
+    markets = {
+        (m.event.cloudbet_id, m.key, m.submarket_key): m
+        for m in Market.objects.filter(event__cloudbet_id__in=event_ids)
+        .select_related('event').prefetch_related('selections')
+    }
+    with transaction.atomic():
+        # Serialize imports into this group, so the skip check and the read-back
+        # below can't pick up another import's bets
+        BettingGroup.objects.select_for_update().only('id').get(id=group.id)
+        existing = set(
+            Bet.objects.filter(group=group, cloudbet_event_id__in=event_ids)
+            .values_list('cloudbet_event_id', 'market_key', 'submarket_key')
+        )
+
+        now = timezone.now()
+        new_bets, skipped, errors = {}, [], []
+        for item in items:
+            event = events.get(item['event_id'])
+            submarket = item.get('submarket') or _default_submarket(markets, item)
+            key = (item['event_id'], item['market'], submarket)
+            market = markets.get(key)
+            if event is None or market is None:
+                errors.append({**item, 'error': 'Market not found in the odds store'})
+                continue
+            if key in existing or key in new_bets:
+                skipped.append(item)
+                continue
+            if event.cutoff_time is None or event.cutoff_time <= now:
+                errors.append({**item, 'error': 'Event has already started'})
+                continue
+
+            bet_type = bet_type_for(market.key)
+            if bet_type is None:
+                errors.append({**item, 'error': 'Market type is not supported for group bets'})
+                continue
+            line = None
+            if bet_type != 'moneyline':
+                line = parse_line(item.get('params') or _main_line(market))
+                if line is None:
+                    errors.append({**item, 'error': 'Could not find the line for this market'})
+                    continue
+                if line * 2 != int(line * 2):
+                    # Quarter lines split the stake across two lines, which a single result can't express
+                    errors.append({**item, 'error': 'Quarter lines are not supported'})
+                    continue
+            new_bets[key] = Bet(
+                group=group,
+                name=f'{event.name} - {market.key.split(".", 1)[-1].replace("_", " ")}'[:200],
+                type=bet_type,
+                points=0,
+                line=line,
+                deadline=event.cutoff_time,
+                cloudbet_event_id=event.cloudbet_id,
+                market_key=market.key,
+                submarket_key=market.submarket_key
+            )
+        if not new_bets:
+            return [], skipped, errors
+
+        # ignore_conflicts is a backstop for bets created outside an import
+        Bet.objects.bulk_create(new_bets.values(), ignore_conflicts=True)
+        # ignore_conflicts leaves pks unset and may have dropped rows, so count what was read back
+        created = [
+            bet for bet in Bet.objects.filter(group=group, cloudbet_event_id__in=event_ids)
+            .only('id', 'cloudbet_event_id', 'market_key', 'submarket_key')
+            if (bet.cloudbet_event_id, bet.market_key, bet.submarket_key) in new_bets
+        ]
+        activity.record_many((group.id, 'bet_created', actor_id, bet.id, None) for bet in created)
+    return created, skipped, errors
+
+def _default_submarket(markets, item):
+    if (item['event_id'], item['market'], DEFAULT_SUBMARKET) in markets:
+        return DEFAULT_SUBMARKET
+    candidates = sorted(
+        submarket for event_id, market, submarket in markets
+        if event_id == item['event_id'] and market == item['market']
+    )
+    return candidates[0] if candidates else DEFAULT_SUBMARKET
+
+def _main_line(market):
+    """Params of the selection priced closest to evens"""
+    priced = [s for s in market.selections.all() if s.price and s.params]
+    if not priced:
+        return None
+    return min(priced, key=lambda s: abs(s.price - 2.0)).params
@@ -1,11 +1,94 @@
 import os
+import logging
+import threading
+import time
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+class CloudbetUnavailable(Exception):
+    """Raised without calling Cloudbet while the circuit breaker is open"""
+
+class CircuitBreaker:
+    """Fails fast after repeated upstream failures, then lets one trial call through"""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: push the window forward so only this caller probes upstream
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+_session = None
+_session_lock = threading.Lock()
+_breaker = None
+
+def get_session():
+    """Process-wide keep-alive session shared by every CloudbetClient"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=settings.CLOUDBET_MAX_RETRIES,
+                    backoff_factor=0.2,
+                    backoff_jitter=0.3,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=['GET'],
+                    raise_on_status=False,
+                    # A long Retry-After would hold the request (and a worker) for its full length
+                    respect_retry_after_header=False
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=settings.CLOUDBET_POOL_SIZE,
+                    pool_maxsize=settings.CLOUDBET_POOL_SIZE,
+                    max_retries=retry
+                )
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+def get_breaker():
+    global _breaker
+    if _breaker is None:
+        with _session_lock:
+            if _breaker is None:
+                _breaker = CircuitBreaker(
+                    settings.CLOUDBET_BREAKER_THRESHOLD,
+                    settings.CLOUDBET_BREAKER_RESET_TIMEOUT
+                )
+    return _breaker
+
 class CloudbetClient:
     SUPPORTED_SPORTS = {
         'american-football': 'NFL',
@@ -23,34 +106,39 @@ class CloudbetClient:
             'Accept': 'application/json',
             'cache-control': 'max-age=600'
         }
+        self.session = get_session()
+        self.breaker = get_breaker()
+        self.timeout = (settings.CLOUDBET_CONNECT_TIMEOUT, settings.CLOUDBET_READ_TIMEOUT)
 
     def get_sports(self):
         """Get list of available sports"""
-        url = f'{self.base_url}/odds/sports'
-        print("\nDEBUG Cloudbet API Request:")
-        print(f"URL: {url}")
-        print(f"API Key (first 20 chars): {self.headers['X-API-Key'][:20]}...")
-        print(f"Full headers being sent: {self.headers}")
-        
-        response = requests.get(url, headers=self.headers)
-        print(f"\nDEBUG Response:")
-        print(f"Status Code: {response.status_code}")
-        print(f"Response Headers: {dict(response.headers)}")
-        print(f"Response Body: {response.text[:500]}...")  # First 500 chars
-        
-        if response.ok:
-            data = response.json()
-            # Filter for only our supported sports with events
-            return [
-                sport for sport in data.get('sports', [])
-                if sport['key'] in self.SUPPORTED_SPORTS 
-                and sport['eventCount'] > 0
-            ]
-        response.raise_for_status()
+        data = self._get('/odds/sports')
+        # Filter for only our supported sports with events
+        return [
+            sport for sport in data.get('sports', [])
+            if sport['key'] in self.SUPPORTED_SPORTS
+            and sport['eventCount'] > 0
+        ]
 
     def get_events(self, sport):
         """Get events for a specific sport"""
-        url = f'{self.base_url}/odds/sports/{sport}'
-        response = requests.get(url, headers=self.headers)
+        return self._get(f'/odds/sports/{sport}')
+
+    def _get(self, path):
+        if not self.breaker.allow():
+            raise CloudbetUnavailable('Cloudbet is unavailable, try again shortly')
+
+        url = f'{self.base_url}{path}'
+        try:
+            response = self.session.get(url, headers=self.headers, timeout=self.timeout)
+        except requests.RequestException:
+            self.breaker.record_failure()
+            raise
+
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        logger.debug('Cloudbet GET %s -> %s in %.3fs', path, response.status_code, response.elapsed.total_seconds())
         response.raise_for_status()
-        return response.json() 
\ No newline at end of file
+        return response.json()
@@ -0,0 +1,59 @@
+import hashlib
+import json
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from .models import BettingGroup
+from .serializers import BettingGroupSerializer
+
+def bump_version(group_id):
+    """Invalidate a group's cached detail; call after membership or field changes.
+
+    The bump runs once the surrounding transaction commits, otherwise a
+    read in between could cache the old rows under the new version.
+    """
+    transaction.on_commit(lambda: _bump(group_id))
+
+def _bump(group_id):
+    try:
+        cache.incr(_version_key(group_id))
+    except ValueError:
+        # Never restart at a low number, an old payload could match it again
+        cache.set(_version_key(group_id), time.time_ns(), None)
+
+def get_detail(group_id):
+    """(payload, etag) for a group's serialized detail, or None if it doesn't exist.
+
+    The version and the payload are read with one get_many; the payload is
+    only used when it was rendered at the current version, so a render
+    racing a bump can never be served after it. Member points in the
+    payload may lag by up to GROUP_DETAIL_CACHE_TTL seconds.
+    """
+    version_key, payload_key = _version_key(group_id), f'group:{group_id}:detail'
+    cached = cache.get_many([version_key, payload_key])
+    version = cached.get(version_key)
+    entry = cached.get(payload_key)
+    if version is not None and entry is not None and entry['version'] == version:
+        return entry['payload'], entry['etag']
+
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(version_key, version, None):
+            version = cache.get(version_key)
+
+    group = (
+        BettingGroup.objects.select_related('president').prefetch_related('members')
+        .filter(id=group_id).first()
+    )
+    if group is None:
+        return None
+    payload = BettingGroupSerializer(group).data
+    digest = hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    etag = f'"group-{group_id}-{digest[:24]}"'
+    cache.set(payload_key, {'version': version, 'payload': payload, 'etag': etag},
+              settings.GROUP_DETAIL_CACHE_TTL)
+    return payload, etag
+
+def _version_key(group_id):
+    return f'group:{group_id}:version'
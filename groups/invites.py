@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from users import outbox
+from .models import BettingGroup, GroupInvite, User
+
+MAX_BATCH = 500
+
+def invite_users(group, inviter, user_ids):
+    """Invite many users to a group with a fixed number of queries.
+
+    Ids are validated in one query, users who are already members or
+    already have an invite (whatever its status) are skipped, and the
+    invites are written with one bulk insert in a single transaction that
+    also queues one outbox event for their notifications. The group row is
+    locked for that transaction, so concurrent calls for the same group
+    never notify the same user twice. Returns (invites, skipped ids,
+    unknown ids).
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    found = dict(
+        User.objects.filter(id__in=user_ids)
+        .annotate(is_member=Exists(BettingGroup.members.through.objects.filter(
+            bettinggroup_id=group.id, user_id=OuterRef('pk')
+        )))
+        .values_list('id', 'is_member')
+    )
+    not_found = [user_id for user_id in user_ids if user_id not in found]
+
+    with transaction.atomic():
+        # Serialize invites to this group, so the rows read back below are only this call's
+        BettingGroup.objects.select_for_update().only('id').get(id=group.id)
+        invited = set(
+            GroupInvite.objects.filter(group=group, to_user_id__in=found).values_list('to_user_id', flat=True)
+        )
+        new_ids = [user_id for user_id, is_member in found.items() if not is_member and user_id not in invited]
+        skipped = [user_id for user_id in user_ids if user_id in found and user_id not in new_ids]
+        if not new_ids:
+            return [], skipped, not_found
+
+        # Invites are only created here, under the group lock; ignore_conflicts is a backstop
+        GroupInvite.objects.bulk_create(
+            [GroupInvite(group=group, to_user_id=user_id, status='pending') for user_id in new_ids],
+            ignore_conflicts=True
+        )
+        invites = list(GroupInvite.objects.filter(group=group, to_user_id__in=new_ids))
+        if invites:
+            outbox.record('group_invites', invite_ids=[invite.id for invite in invites], from_user_id=inviter.id)
+    return invites, skipped, not_found
@@ -0,0 +1,55 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from groups.models import BettingGroup
+from groups.views import get_groups
+from users.models import User
+
+class Command(BaseCommand):
+    help = 'Check that group list queries stay constant as the group count grows (synthetic data, rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--groups', type=int, default=500)
+        parser.add_argument('--members', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=f'bench-groups-{i}') for i in range(options['members'])
+            ])
+            viewer = users[0]
+            results = {}
+            for count in (1, options['groups']):
+                BettingGroup.objects.filter(members=viewer).delete()
+                groups = BettingGroup.objects.bulk_create([
+                    BettingGroup(name=f'bench-group-{i}', president=viewer) for i in range(count)
+                ])
+                BettingGroup.members.through.objects.bulk_create([
+                    BettingGroup.members.through(bettinggroup_id=group.id, user_id=user.id)
+                    for group in groups for user in users
+                ], batch_size=5000)
+                for mode in ('', 'summary=1', 'limit=50'):
+                    results[count, mode] = self._measure(viewer, mode)
+            transaction.set_rollback(True)
+
+        failed = False
+        for mode in ('', 'summary=1', 'limit=50'):
+            small, large = results[1, mode], results[options['groups'], mode]
+            self.stdout.write(
+                f'{mode or "full":>10}: 1 group {small[0]} queries {small[1] * 1000:.1f}ms, '
+                f'{options["groups"]} groups {large[0]} queries {large[1] * 1000:.1f}ms'
+            )
+            failed |= small[0] != large[0]
+        if failed:
+            raise CommandError('Query count grows with the number of groups')
+
+    def _measure(self, user, query):
+        request = APIRequestFactory().get(f'/api/groups/?{query}')
+        force_authenticate(request, user=user)
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            response = get_groups(request)
+            response.render()
+        return len(queries), time.perf_counter() - started
@@ -0,0 +1,73 @@
+import random
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from users.models import User
+from groups.models import BettingGroup, Bet, UserBet
+from groups.payouts import BET_CHOICES, settle_scores
+from groups.settlement import PAYOUT_MULTIPLIER
+
+
+class Command(BaseCommand):
+    help = 'Compare vectorized payout settlement with a per-row ORM loop (synthetic data, rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wagers', type=int, default=20000)
+        parser.add_argument('--bets', type=int, default=20)
+
+    def handle(self, *args, **options):
+        per_row = self._run(options, self._settle_per_row)
+        vectorized = self._run(options, settle_scores)
+        self.stdout.write(f'Per-row:    {per_row:.2f}s ({options["wagers"] / per_row:.0f} wagers/s)')
+        self.stdout.write(f'Vectorized: {vectorized:.2f}s ({options["wagers"] / vectorized:.0f} wagers/s), '
+                          f'{per_row / vectorized:.1f}x faster')
+
+    def _run(self, options, settle):
+        with transaction.atomic():
+            n_bets = options['bets']
+            n_users = -(-options['wagers'] // n_bets)
+            users = User.objects.bulk_create(
+                [User(username=f'bench-payout-{i}') for i in range(n_users)], batch_size=5000
+            )
+            group = BettingGroup.objects.create(name='Payout benchmark', president=users[0])
+            bets = Bet.objects.bulk_create([
+                Bet(group=group, name=f'Bet {i}', type=bet_type, points=random.randint(-7, 50),
+                    status='closed', deadline=timezone.now() - timedelta(minutes=1))
+                for i, bet_type in enumerate(random.choice(list(BET_CHOICES)) for _ in range(n_bets))
+            ])
+            UserBet.objects.bulk_create([
+                UserBet(user=user, bet=bet, choice=random.choice(BET_CHOICES[bet.type]), points_wagered=10)
+                for bet in bets for user in users
+            ][:options['wagers']], batch_size=5000)
+            scores = {bet.id: (random.randint(0, 40), random.randint(0, 40)) for bet in bets}
+
+            started = time.monotonic()
+            settle(scores)
+            elapsed = time.monotonic() - started
+            transaction.set_rollback(True)
+        return elapsed
+
+    def _settle_per_row(self, scores):
+        """Baseline: decide each wager in Python and save it and its user one row at a time"""
+        for wager in UserBet.objects.filter(bet_id__in=scores, result='pending').select_related('bet', 'user'):
+            home, away = scores[wager.bet_id]
+            side = 1 if wager.choice in ('home', 'over') else -1
+            if wager.bet.type == 'moneyline':
+                edge = side * (home - away)
+            elif wager.bet.type == 'spread':
+                edge = side * (home - away + wager.bet.points)
+            else:
+                edge = side * (home + away - wager.bet.points)
+            if edge > 0:
+                wager.result = 'won'
+                wager.user.points += wager.points_wagered * PAYOUT_MULTIPLIER
+            elif edge == 0:
+                wager.result = 'push'
+                wager.user.points += wager.points_wagered
+            else:
+                wager.result = 'lost'
+            wager.save()
+            wager.user.save()
+        Bet.objects.filter(id__in=scores).update(status='settled')
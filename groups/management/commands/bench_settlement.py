@@ -0,0 +1,51 @@
+import random
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from users.models import User
+from groups.models import BettingGroup, Bet, UserBet
+from groups.settlement import settle_bets
+
+class Command(BaseCommand):
+    help = 'Benchmark bulk settlement on synthetic wagers (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wagers', type=int, default=100000)
+        parser.add_argument('--bets', type=int, default=100)
+
+    def handle(self, *args, **options):
+        n_bets = options['bets']
+        n_users = -(-options['wagers'] // n_bets)  # One wager per user per bet
+
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [User(username=f'bench-settle-{i}') for i in range(n_users)], batch_size=5000
+            )
+            group = BettingGroup.objects.create(name='Settlement benchmark', president=users[0])
+            bets = Bet.objects.bulk_create([
+                Bet(group=group, name=f'Bet {i}', type='moneyline', points=0,
+                    status='closed', deadline=timezone.now() - timedelta(minutes=1))
+                for i in range(n_bets)
+            ])
+            wagers = [
+                UserBet(user=user, bet=bet, choice=random.choice(('home', 'away')), points_wagered=10)
+                for bet in bets for user in users
+            ][:options['wagers']]
+            UserBet.objects.bulk_create(wagers, batch_size=5000)
+
+            outcomes = {bet.id: random.choice(('home', 'away')) for bet in bets}
+            started = time.monotonic()
+            totals = settle_bets(outcomes)
+            elapsed = time.monotonic() - started
+            rerun_started = time.monotonic()
+            rerun = settle_bets(outcomes)
+            rerun_elapsed = time.monotonic() - rerun_started
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"Settled {len(wagers)} wagers on {n_bets} bets in {elapsed:.2f}s "
+            f"({len(wagers) / elapsed:.0f} wagers/s); {totals['users_credited']} user credits"
+        )
+        self.stdout.write(f"Re-run settled {rerun['bets']} bets in {rerun_elapsed:.3f}s (idempotent)")
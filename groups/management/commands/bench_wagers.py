@@ -0,0 +1,86 @@
+import random
+import threading
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Sum
+from django.utils import timezone
+from users.models import User
+from groups.models import BettingGroup, Bet, UserBet
+from groups.wagers import WagerError, place_wager
+
+class Command(BaseCommand):
+    help = 'Stress concurrent wager placement on one bet and check the point invariants'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--attempts', type=int, default=3, help='Wager attempts per user')
+        parser.add_argument('--points', type=int, default=100, help='Starting points per user')
+
+    def handle(self, *args, **options):
+        prefix = f'bench-wager-{int(time.time())}'
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}-{i}', points=options['points']) for i in range(options['users'])
+        ])
+        group = BettingGroup.objects.create(name=prefix, president=users[0])
+        group.members.add(*users)
+        bet = Bet.objects.create(group=group, name=prefix, type='moneyline', points=0,
+                                 deadline=timezone.now() + timedelta(hours=1))
+
+        # Every user retries several times with random stakes, some above their balance
+        jobs = [
+            (user, random.choice(('home', 'away')), random.randint(1, options['points'] * 2))
+            for user in users for _ in range(options['attempts'])
+        ]
+        random.shuffle(jobs)
+        outcomes = {'placed': 0, 'refused': 0, 'errors': 0}
+        lock = threading.Lock()
+
+        def worker(chunk):
+            try:
+                for user, choice, stake in chunk:
+                    try:
+                        place_wager(user, bet.id, choice, stake)
+                        result = 'placed'
+                    except WagerError:
+                        result = 'refused'
+                    except Exception:
+                        result = 'errors'
+                    with lock:
+                        outcomes[result] += 1
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(jobs[i::options['threads']],))
+                   for i in range(options['threads'])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        try:
+            balances = User.objects.filter(id__in=[u.id for u in users])
+            wagers = UserBet.objects.filter(bet=bet)
+            remaining = balances.aggregate(total=Sum('points'))['total']
+            wagered = wagers.aggregate(total=Sum('points_wagered'))['total'] or 0
+            expected = options['points'] * len(users)
+
+            if remaining + wagered != expected:
+                raise CommandError(f'Points not conserved: {remaining} + {wagered} != {expected}')
+            if balances.filter(points__lt=0).exists():
+                raise CommandError('A user was overdrawn')
+            if wagers.count() != outcomes['placed'] or wagers.values('user').distinct().count() != wagers.count():
+                raise CommandError('Duplicate or lost wagers')
+
+            self.stdout.write(
+                f"{outcomes['placed']} wagers placed, {outcomes['refused']} refused, "
+                f"{outcomes['errors']} errors in {elapsed:.2f}s "
+                f"({len(jobs) / elapsed:.0f} attempts/s, {outcomes['placed'] / elapsed:.0f} wagers/s); "
+                'invariants hold'
+            )
+        finally:
+            User.objects.filter(username__startswith=prefix).delete()
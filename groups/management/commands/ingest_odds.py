@@ -0,0 +1,30 @@
+import time
+from django.core.management.base import BaseCommand
+from groups.cloudbet import CloudbetClient
+from groups import odds_store
+
+class Command(BaseCommand):
+    help = 'Pull Cloudbet events and markets into the local odds store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sport', action='append', choices=list(CloudbetClient.SUPPORTED_SPORTS),
+                            help='Sport key to ingest (repeatable, defaults to all supported sports)')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Keep running and refresh every N seconds')
+
+    def handle(self, *args, **options):
+        sports = options['sport'] or list(CloudbetClient.SUPPORTED_SPORTS)
+        while True:
+            client = CloudbetClient()
+            for sport in sports:
+                started = time.monotonic()
+                try:
+                    count = odds_store.ingest_sport(sport, client)
+                except Exception as e:
+                    self.stderr.write(f'{sport}: refresh failed, keeping last snapshot ({e})')
+                    continue
+                self.stdout.write(f'{sport}: {count} events in {time.monotonic() - started:.2f}s')
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
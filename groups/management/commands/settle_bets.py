@@ -0,0 +1,49 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from groups.payouts import settle_scores
+from groups.settlement import settle_bets, BATCH_SIZE
+
+class Command(BaseCommand):
+    help = 'Settle bets from their outcomes, crediting winners in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('outcomes', nargs='*', help='Outcomes as bet_id=winning_choice')
+        parser.add_argument('--file', help='JSON file mapping bet ids to winning choices')
+        parser.add_argument('--scores', help='JSON file mapping bet ids to [home_score, away_score]; '
+                                             'results are computed from each bet type and line')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['scores']:
+            with open(options['scores']) as f:
+                scores = {int(bet_id): tuple(score) for bet_id, score in json.load(f).items()}
+            started = time.monotonic()
+            totals = settle_scores(scores, options['batch_size'])
+            self._report(totals, totals['won'] + totals['lost'] + totals['push'], time.monotonic() - started)
+            return
+
+        outcomes = {}
+        if options['file']:
+            with open(options['file']) as f:
+                outcomes.update({int(bet_id): choice for bet_id, choice in json.load(f).items()})
+        for item in options['outcomes']:
+            bet_id, sep, choice = item.partition('=')
+            if not sep or not bet_id.isdigit():
+                raise CommandError(f'Expected bet_id=winning_choice, got {item!r}')
+            outcomes[int(bet_id)] = choice
+        if not outcomes:
+            raise CommandError('No outcomes given')
+
+        started = time.monotonic()
+        totals = settle_bets(outcomes, options['batch_size'])
+        self._report(totals, totals['won'] + totals['lost'], time.monotonic() - started)
+
+    def _report(self, totals, wagers, elapsed):
+        self.stdout.write(
+            f"Settled {totals['bets']} bets: {totals['won']} won, {totals['lost']} lost, "
+            f"{totals.get('push', 0)} pushed, {totals['users_credited']} users credited in {elapsed:.2f}s "
+            f"({wagers / elapsed if elapsed else 0:.0f} wagers/s)"
+        )
+        if totals['not_closed']:
+            self.stderr.write(f"Refused {totals['not_closed']} bets that are still open for wagers")
@@ -0,0 +1,25 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from groups import sweeper
+
+class Command(BaseCommand):
+    help = 'Close bets past their deadline and notify members of bets closing soon'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running, sweeping every BET_SWEEP_INTERVAL seconds')
+        parser.add_argument('--batch-size', type=int, default=settings.BET_SWEEP_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            closed = sweeper.close_expired(batch_size=options['batch_size'])
+            notified = sweeper.notify_closing_soon()
+            self.stdout.write(
+                f'Closed {closed} bets, sent {notified} closing notifications in {time.monotonic() - started:.2f}s'
+            )
+
+            if not options['loop']:
+                break
+            time.sleep(settings.BET_SWEEP_INTERVAL)
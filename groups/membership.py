@@ -0,0 +1,17 @@
+from django.db import transaction
+from users.suggestions import friend_suggestions
+from . import activity, group_cache, standings
+
+def member_joined(group_id, user_ids):
+    """Side effects of users joining a group; call right after adding them to members.
+
+    Standings and the activity feed are written in the caller's transaction
+    (or a new one). The suggestion graph and the detail cache version only
+    change once it commits.
+    """
+    user_ids = list(user_ids)
+    with transaction.atomic():
+        standings.add_members(group_id, user_ids)
+        activity.record_joins(group_id, user_ids)
+        transaction.on_commit(lambda: [friend_suggestions.add_member(group_id, user_id) for user_id in user_ids])
+        group_cache.bump_version(group_id)
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sport', models.CharField(max_length=50)),
+                ('cloudbet_id', models.BigIntegerField(unique=True)),
+                ('key', models.CharField(blank=True, max_length=255)),
+                ('name', models.CharField(max_length=255)),
+                ('competition_key', models.CharField(blank=True, max_length=255)),
+                ('competition_name', models.CharField(blank=True, max_length=255)),
+                ('home', models.JSONField(blank=True, null=True)),
+                ('away', models.JSONField(blank=True, null=True)),
+                ('status', models.CharField(blank=True, max_length=50)),
+                ('cutoff_time', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Market',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100)),
+                ('submarket_key', models.CharField(blank=True, max_length=100)),
+                ('sequence', models.CharField(blank=True, max_length=50)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='markets', to='groups.event')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SportSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sport', models.CharField(max_length=50, unique=True)),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('event_count', models.IntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Selection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('outcome', models.CharField(max_length=100)),
+                ('params', models.CharField(blank=True, max_length=100)),
+                ('price', models.FloatField(null=True)),
+                ('probability', models.FloatField(null=True)),
+                ('min_stake', models.FloatField(null=True)),
+                ('max_stake', models.FloatField(null=True)),
+                ('status', models.CharField(blank=True, max_length=50)),
+                ('side', models.CharField(blank=True, max_length=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('market', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='selections', to='groups.market')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['sport', 'cutoff_time'], name='groups_even_sport_1a2922_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='selection',
+            unique_together={('market', 'outcome', 'params')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='market',
+            unique_together={('event', 'key', 'submarket_key')},
+        ),
+    ]
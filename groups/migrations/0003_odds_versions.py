@@ -0,0 +1,56 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0002_odds_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OddsRemoval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sport', models.CharField(max_length=50)),
+                ('version', models.PositiveBigIntegerField()),
+                ('event_id', models.BigIntegerField()),
+                ('market_key', models.CharField(blank=True, max_length=100)),
+                ('submarket_key', models.CharField(blank=True, max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='market',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='market',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['sport', 'version'], name='groups_even_sport_159d8b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='market',
+            index=models.Index(fields=['version'], name='groups_mark_version_4d923c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='oddsremoval',
+            index=models.Index(fields=['sport', 'version'], name='groups_odds_sport_d52e2c_idx'),
+        ),
+    ]
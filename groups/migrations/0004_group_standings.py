@@ -0,0 +1,61 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_standings(apps, schema_editor):
+    """Build standings for existing members from the wagers already placed"""
+    BettingGroup = apps.get_model('groups', 'BettingGroup')
+    UserBet = apps.get_model('groups', 'UserBet')
+    GroupStanding = apps.get_model('groups', 'GroupStanding')
+
+    standings = {
+        (group_id, user_id): GroupStanding(group_id=group_id, user_id=user_id)
+        for group_id, user_id in BettingGroup.members.through.objects.values_list('bettinggroup_id', 'user_id')
+    }
+    rows = UserBet.objects.values_list('bet__group_id', 'user_id', 'result', 'points_wagered')
+    for group_id, user_id, result, points_wagered in rows.iterator():
+        standing = standings.setdefault((group_id, user_id), GroupStanding(group_id=group_id, user_id=user_id))
+        if result == 'won':
+            standing.points_won += points_wagered
+            standing.wins += 1
+        elif result == 'lost':
+            standing.points_lost += points_wagered
+            standing.losses += 1
+        else:
+            standing.pending_exposure += points_wagered
+        standing.net = standing.points_won - standing.points_lost
+    GroupStanding.objects.bulk_create(standings.values(), batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('groups', '0003_odds_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points_won', models.IntegerField(default=0)),
+                ('points_lost', models.IntegerField(default=0)),
+                ('net', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('pending_exposure', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='groups.bettinggroup')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_standings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', '-net', 'user'], name='groups_grou_group_i_0ae66d_idx')],
+                'unique_together': {('group', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_standings, migrations.RunPython.noop),
+    ]
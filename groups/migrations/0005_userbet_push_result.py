@@ -0,0 +1,18 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0004_group_standings'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userbet',
+            name='result',
+            field=models.CharField(choices=[('pending', 'Pending'), ('won', 'Won'), ('lost', 'Lost'), ('push', 'Push')], default='pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0005_userbet_push_result'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bet',
+            name='cloudbet_event_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bet',
+            name='line',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bet',
+            name='market_key',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='bet',
+            name='submarket_key',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='bet',
+            constraint=models.UniqueConstraint(condition=models.Q(('cloudbet_event_id__isnull', False)), fields=('group', 'cloudbet_event_id', 'market_key', 'submarket_key'), name='unique_imported_bet'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0006_bet_cloudbet_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bet',
+            name='closing_notified',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(fields=['status', 'deadline'], name='groups_bet_status_36dad1_idx'),
+        ),
+    ]
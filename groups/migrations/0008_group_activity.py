@@ -0,0 +1,31 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('groups', '0007_bet_sweep'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('member_joined', 'Member Joined'), ('bet_created', 'Bet Created'), ('wager_placed', 'Wager Placed'), ('bet_settled', 'Bet Settled')], max_length=20)),
+                ('points', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('bet', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='groups.bet')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='groups.bettinggroup')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', '-created_at', '-id'], name='groups_grou_group_i_1bea3e_idx')],
+            },
+        ),
+    ]
@@ -10,6 +10,16 @@ class BettingGroup(models.Model):
     members = models.ManyToManyField('users.User', related_name='betting_groups')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .group_cache import bump_version  # group_cache imports this module
+        bump_version(self.id)
+
+    def delete(self, *args, **kwargs):
+        from .group_cache import bump_version
+        bump_version(self.id)
+        return super().delete(*args, **kwargs)
+
 class Bet(models.Model):
     """Model for bets within a group"""
     group = models.ForeignKey(BettingGroup, related_name='bets', on_delete=models.CASCADE)
@@ -23,6 +33,24 @@ class Bet(models.Model):
     ], default='open')
     created_at = models.DateTimeField(auto_now_add=True)
     deadline = models.DateTimeField()
+    line = models.FloatField(null=True, blank=True)  # Fractional spread/total line; falls back to points
+    # Source market for bets imported from Cloudbet
+    cloudbet_event_id = models.BigIntegerField(null=True, blank=True)
+    market_key = models.CharField(max_length=100, blank=True)
+    submarket_key = models.CharField(max_length=100, blank=True)
+    closing_notified = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'deadline']),  # Deadline sweeps
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['group', 'cloudbet_event_id', 'market_key', 'submarket_key'],
+                condition=models.Q(cloudbet_event_id__isnull=False),
+                name='unique_imported_bet'
+            )
+        ]
 
 class UserBet(models.Model):
     """Model for users' bets"""
@@ -34,12 +62,46 @@ class UserBet(models.Model):
         ('pending', 'Pending'),
         ('won', 'Won'),
         ('lost', 'Lost'),
+        ('push', 'Push'),  # Tie against the line, stake refunded
     ], default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ('user', 'bet')
 
+class GroupStanding(models.Model):
+    """Running totals of a member's wagers in a group, maintained incrementally"""
+    group = models.ForeignKey(BettingGroup, on_delete=models.CASCADE, related_name='standings')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='group_standings')
+    points_won = models.IntegerField(default=0)
+    points_lost = models.IntegerField(default=0)
+    net = models.IntegerField(default=0)  # points_won - points_lost, what the leaderboard ranks by
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    pending_exposure = models.IntegerField(default=0)  # Points on unsettled wagers
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('group', 'user')
+        indexes = [models.Index(fields=['group', '-net', 'user'])]
+
+class GroupActivity(models.Model):
+    """Append-only feed entry for something that happened in a group"""
+    group = models.ForeignKey(BettingGroup, on_delete=models.CASCADE, related_name='activity')
+    kind = models.CharField(max_length=20, choices=[
+        ('member_joined', 'Member Joined'),
+        ('bet_created', 'Bet Created'),
+        ('wager_placed', 'Wager Placed'),
+        ('bet_settled', 'Bet Settled'),
+    ])
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    bet = models.ForeignKey(Bet, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    points = models.IntegerField(null=True, blank=True)  # Stake for wagers
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['group', '-created_at', '-id'])]
+
 class GroupInvite(models.Model):
     group = models.ForeignKey(BettingGroup, on_delete=models.CASCADE, related_name='invites')
     to_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='group_invites')
@@ -51,4 +113,77 @@ class GroupInvite(models.Model):
     ], default='pending')
 
     class Meta:
-        unique_together = ('group', 'to_user') 
\ No newline at end of file
+        unique_together = ('group', 'to_user') 
+
+class SportSnapshot(models.Model):
+    """Last successful ingestion of a sport's odds from Cloudbet"""
+    sport = models.CharField(max_length=50, unique=True)  # Cloudbet sport key
+    name = models.CharField(max_length=100, blank=True)
+    version = models.PositiveBigIntegerField(default=0)  # Bumped on every successful refresh
+    event_count = models.IntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+class Event(models.Model):
+    """Cloudbet event normalized from the odds feed"""
+    sport = models.CharField(max_length=50)
+    cloudbet_id = models.BigIntegerField(unique=True)
+    key = models.CharField(max_length=255, blank=True)
+    name = models.CharField(max_length=255)
+    competition_key = models.CharField(max_length=255, blank=True)
+    competition_name = models.CharField(max_length=255, blank=True)
+    home = models.JSONField(null=True, blank=True)
+    away = models.JSONField(null=True, blank=True)
+    status = models.CharField(max_length=50, blank=True)
+    cutoff_time = models.DateTimeField(null=True, blank=True)
+    version = models.PositiveBigIntegerField(default=0)  # Snapshot version that last changed the event
+    content_hash = models.CharField(max_length=40, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['sport', 'cutoff_time']),
+            models.Index(fields=['sport', 'version']),
+        ]
+
+class Market(models.Model):
+    """One submarket of an event, e.g. soccer.match_odds / period=ft"""
+    event = models.ForeignKey(Event, related_name='markets', on_delete=models.CASCADE)
+    key = models.CharField(max_length=100)
+    submarket_key = models.CharField(max_length=100, blank=True)
+    sequence = models.CharField(max_length=50, blank=True)
+    version = models.PositiveBigIntegerField(default=0)  # Snapshot version that last changed a price
+    content_hash = models.CharField(max_length=40, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('event', 'key', 'submarket_key')
+        indexes = [models.Index(fields=['version'])]
+
+class Selection(models.Model):
+    """A priced outcome within a market"""
+    market = models.ForeignKey(Market, related_name='selections', on_delete=models.CASCADE)
+    outcome = models.CharField(max_length=100)
+    params = models.CharField(max_length=100, blank=True)
+    price = models.FloatField(null=True)
+    probability = models.FloatField(null=True)
+    min_stake = models.FloatField(null=True)
+    max_stake = models.FloatField(null=True)
+    status = models.CharField(max_length=50, blank=True)
+    side = models.CharField(max_length=20, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('market', 'outcome', 'params')
+
+class OddsRemoval(models.Model):
+    """Tombstone for an event or market that disappeared from the feed, kept for delta queries"""
+    sport = models.CharField(max_length=50)
+    version = models.PositiveBigIntegerField()
+    event_id = models.BigIntegerField()  # Cloudbet event id
+    market_key = models.CharField(max_length=100, blank=True)  # Empty when the whole event was removed
+    submarket_key = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['sport', 'version'])]
@@ -0,0 +1,129 @@
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from .cloudbet import CloudbetClient
+
+class OddsCache:
+    """Shared cache in front of CloudbetClient.
+
+    Entries live in Django's cache framework so every gunicorn worker sees the
+    same data. Each entry is fresh for a per-sport TTL and may then be served
+    stale for CLOUDBET_CACHE_STALE_TTL seconds while one worker refreshes it in
+    the background. Concurrent misses for the same key are merged into a single
+    upstream call (per process with a lock, across processes with cache.add).
+    """
+    KEY_PREFIX = 'cloudbet'
+    STATS = ('hit', 'stale', 'miss', 'refresh', 'error')
+
+    def __init__(self, client_factory=CloudbetClient):
+        self.client_factory = client_factory
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def get_sports(self):
+        """Get list of available sports"""
+        return self._get('sports', lambda: self.client_factory().get_sports(), self._ttl('sports'))
+
+    def get_events(self, sport):
+        """Get events for a specific sport"""
+        return self._get(f'events:{sport}', lambda: self.client_factory().get_events(sport), self._ttl(sport))
+
+    def invalidate(self, sport=None):
+        """Drop the cached sports list, or the events of one sport"""
+        cache.delete(self._key(f'events:{sport}' if sport else 'sports'))
+
+    def stats(self):
+        """Return the hit/miss/refresh counters shared by all workers"""
+        keys = {self._key(f'stats:{name}'): name for name in self.STATS}
+        values = cache.get_many(list(keys))
+        return {name: values.get(key, 0) for key, name in keys.items()}
+
+    def _get(self, name, loader, ttl):
+        key = self._key(name)
+        entry = cache.get(key)
+        if entry is not None:
+            if time.time() < entry['fresh_until']:
+                self._count('hit')
+            else:
+                self._count('stale')
+                self._refresh_in_background(key, loader, ttl)
+            return entry['data']
+
+        self._count('miss')
+        return self._load_single_flight(key, loader, ttl)
+
+    def _load_single_flight(self, key, loader, ttl):
+        with self._local_lock(key):
+            # Another thread in this process may have filled the key while we waited
+            entry = cache.get(key)
+            if entry is not None:
+                return entry['data']
+
+            lock_key = f'{key}:lock'
+            if cache.add(lock_key, 1, self._lock_timeout()):
+                try:
+                    return self._load(key, loader, ttl)
+                finally:
+                    cache.delete(lock_key)
+
+            # Another worker is fetching; wait for its result instead of calling upstream too
+            deadline = time.time() + self._lock_timeout()
+            while time.time() < deadline:
+                time.sleep(0.05)
+                entry = cache.get(key)
+                if entry is not None:
+                    return entry['data']
+                if cache.get(lock_key) is None:
+                    break
+            return self._load(key, loader, ttl)
+
+    def _refresh_in_background(self, key, loader, ttl):
+        lock_key = f'{key}:lock'
+        if not cache.add(lock_key, 1, self._lock_timeout()):
+            return  # A refresh is already running somewhere
+
+        def refresh():
+            try:
+                self._load(key, loader, ttl)
+                self._count('refresh')
+            except Exception:
+                pass  # Keep serving the stale entry; errors are counted in _load
+            finally:
+                cache.delete(lock_key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _load(self, key, loader, ttl):
+        try:
+            data = loader()
+        except Exception:
+            self._count('error')
+            raise
+        entry = {'data': data, 'fresh_until': time.time() + ttl}
+        cache.set(key, entry, ttl + settings.CLOUDBET_CACHE_STALE_TTL)
+        return data
+
+    def _local_lock(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _count(self, name):
+        key = self._key(f'stats:{name}')
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, None):
+                cache.incr(key)
+
+    def _ttl(self, name):
+        ttls = settings.CLOUDBET_CACHE_TTLS
+        return ttls.get(name, ttls['default'])
+
+    def _lock_timeout(self):
+        return settings.CLOUDBET_CACHE_LOCK_TIMEOUT
+
+    def _key(self, name):
+        return f'{self.KEY_PREFIX}:{name}'
+
+odds_cache = OddsCache()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .odds_store import iter_competitions
+
+QUERY_PARAMS = ('competition', 'start_after', 'start_before', 'markets', 'fields', 'page', 'limit')
+MAX_LIMIT = 500
+
+class InvalidQuery(ValueError):
+    """Raised for malformed filter or pagination params"""
+
+def etag_for(sport, payload, params):
+    """ETag for a filtered response; versioned payloads avoid hashing the body"""
+    query = sorted((name, params.get(name)) for name in QUERY_PARAMS + ('since',) if params.get(name))
+    source = payload.get('cursor') if isinstance(payload, dict) else None
+    if source is None:
+        source = json.dumps(payload, sort_keys=True, default=str)
+    digest = hashlib.sha1(json.dumps([sport, source, query], default=str).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+def etag_matches(header, etag):
+    """Whether an If-None-Match header already holds this ETag"""
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+    return '*' in candidates or etag in candidates
+
+def apply_query(payload, params):
+    """Filter, project and paginate a Cloudbet-shaped sport payload.
+
+    Supported params: competition (comma separated keys), start_after and
+    start_before (ISO datetimes compared to cutoffTime), markets (comma
+    separated market keys), fields (comma separated event fields, id is
+    always kept), page and limit. Raises InvalidQuery on malformed params.
+    """
+    if not any(params.get(name) for name in QUERY_PARAMS):
+        return payload
+
+    competitions = _split(params.get('competition'))
+    markets = _split(params.get('markets'))
+    fields = _split(params.get('fields'))
+    start_after = _parse_time(params.get('start_after'), 'start_after')
+    start_before = _parse_time(params.get('start_before'), 'start_before')
+
+    events = []
+    for competition in iter_competitions(payload):
+        if competitions and competition.get('key') not in competitions:
+            continue
+        for event in competition.get('events', []):
+            if start_after or start_before:
+                cutoff = _parse_time(event.get('cutoffTime'), 'cutoffTime')
+                if start_after and (cutoff is None or cutoff < start_after):
+                    continue
+                if start_before and (cutoff is None or cutoff > start_before):
+                    continue
+            if markets:
+                event = {**event, 'markets': {
+                    key: market for key, market in (event.get('markets') or {}).items() if key in markets
+                }}
+            if fields:
+                event = {key: value for key, value in event.items() if key in fields or key == 'id'}
+            events.append((competition, event))
+
+    total = len(events)
+    page, limit = params.get('page'), params.get('limit')
+    if page or limit:
+        page, limit = _positive_int(page or 1, 'page'), min(_positive_int(limit or 100, 'limit'), MAX_LIMIT)
+        events = events[(page - 1) * limit:page * limit]
+
+    grouped = {}
+    for competition, event in events:
+        grouped.setdefault(competition.get('key'), {
+            'name': competition.get('name'),
+            'key': competition.get('key'),
+            'events': [],
+        })['events'].append(event)
+
+    # Raw Cloudbet payloads nest competitions under categories; answer flat either way
+    result = {key: value for key, value in payload.items() if key != 'categories'}
+    result.update(competitions=list(grouped.values()), total=total)
+    if page:
+        result.update(page=page, limit=limit)
+    return result
+
+def _split(value):
+    return {part.strip() for part in value.split(',') if part.strip()} if value else None
+
+def _parse_time(value, name):
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise InvalidQuery(f'{name} must be an ISO 8601 datetime')
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+def _positive_int(value, name):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise InvalidQuery(f'{name} must be a positive integer')
+    if value < 1:
+        raise InvalidQuery(f'{name} must be a positive integer')
+    return value
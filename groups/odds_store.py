@@ -0,0 +1,306 @@
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from roster_royals.broadcast import broadcaster, odds_channel
+from .cloudbet import CloudbetClient
+from .models import SportSnapshot, Event, Market, Selection, OddsRemoval
+
+BATCH_SIZE = 1000
+RENDER_CACHE_TTL = 3600  # Rendered snapshots are keyed by version, so this only bounds memory
+
+EVENT_FIELDS = ['sport', 'key', 'name', 'competition_key', 'competition_name',
+                'home', 'away', 'status', 'cutoff_time', 'version', 'content_hash', 'updated_at']
+MARKET_FIELDS = ['sequence', 'version', 'content_hash', 'updated_at']
+SELECTION_FIELDS = ['price', 'probability', 'min_stake', 'max_stake', 'status', 'side', 'updated_at']
+
+def ingest_sport(sport, client=None):
+    """Pull one sport from Cloudbet and upsert it into the local odds store.
+
+    Events and markets whose content changed are stamped with the new
+    snapshot version, and removals are recorded as tombstones, so delta
+    queries can return only what moved. The previous snapshot is left
+    untouched if the upstream call fails, so readers keep the last good data.
+    """
+    client = client or CloudbetClient()
+    started = timezone.now()
+    try:
+        payload = client.get_events(sport)
+    except Exception as e:
+        SportSnapshot.objects.update_or_create(
+            sport=sport,
+            defaults={'last_attempt_at': started, 'last_error': str(e)}
+        )
+        raise
+
+    with transaction.atomic():
+        SportSnapshot.objects.get_or_create(sport=sport)
+        snapshot = SportSnapshot.objects.select_for_update().get(sport=sport)
+        version = snapshot.version + 1
+        event_count = _upsert(sport, payload, started, version)
+        OddsRemoval.objects.filter(
+            sport=sport, version__lte=version - settings.ODDS_DELTA_RETENTION
+        ).delete()
+
+        snapshot.name = payload.get('name', '')
+        snapshot.version = version
+        snapshot.event_count = event_count
+        snapshot.refreshed_at = timezone.now()
+        snapshot.last_attempt_at = started
+        snapshot.last_error = ''
+        snapshot.save()
+        if _changed(sport, version):
+            broadcaster.publish(odds_channel(sport), {'type': 'odds', 'sport': sport, 'cursor': version})
+    return event_count
+
+def get_sports():
+    """Sports with events in the local store, or None if nothing was ingested yet"""
+    snapshots = list(SportSnapshot.objects.filter(
+        refreshed_at__isnull=False,
+        sport__in=CloudbetClient.SUPPORTED_SPORTS
+    ))
+    if not snapshots:
+        return None
+    return [
+        {'key': s.sport, 'name': s.name, 'eventCount': s.event_count}
+        for s in snapshots if s.event_count > 0
+    ]
+
+def get_events(sport, since=None):
+    """Cloudbet-shaped payload for a sport, or None if it was never ingested.
+
+    With a `since` cursor (the `cursor` of an earlier response) only events
+    and markets changed after it are returned, along with removals. A market
+    present in a delta replaces the client's copy; markets left out are
+    unchanged. Cursors older than the tombstone retention get the full
+    payload back with `reset` set.
+    """
+    snapshot = get_snapshot(sport)
+    if snapshot is None:
+        return None
+    if since is not None and since >= snapshot.version - settings.ODDS_DELTA_RETENTION:
+        return _render_delta(snapshot, since)
+
+    key = f'odds_store:{sport}:{snapshot.version}'
+    payload = cache.get(key)
+    if payload is None:
+        payload = _render(snapshot)
+        cache.set(key, payload, RENDER_CACHE_TTL)
+    if since is not None:
+        payload = {**payload, 'reset': True}
+    return payload
+
+def get_snapshot(sport):
+    return SportSnapshot.objects.filter(sport=sport, refreshed_at__isnull=False).first()
+
+def _changed(sport, version):
+    """Whether an ingest stamped anything with its version"""
+    return (
+        Event.objects.filter(sport=sport, version=version).exists()
+        or Market.objects.filter(event__sport=sport, version=version).exists()
+        or OddsRemoval.objects.filter(sport=sport, version=version).exists()
+    )
+
+def iter_competitions(payload):
+    """Competitions of a sport payload, top level or nested under categories"""
+    yield from payload.get('competitions', [])
+    for category in payload.get('categories', []):
+        yield from category.get('competitions', [])
+
+def _parse_time(value):
+    return parse_datetime(value) if value else None
+
+def _hash(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+def _upsert(sport, payload, started, version):
+    old_events = {
+        cloudbet_id: (content_hash, event_version)
+        for cloudbet_id, content_hash, event_version in Event.objects.filter(sport=sport).values_list(
+            'cloudbet_id', 'content_hash', 'version'
+        )
+    }
+    old_markets = {
+        (cloudbet_id, key, submarket_key): (content_hash, market_version)
+        for cloudbet_id, key, submarket_key, content_hash, market_version in Market.objects.filter(
+            event__sport=sport
+        ).values_list('event__cloudbet_id', 'key', 'submarket_key', 'content_hash', 'version')
+    }
+
+    def stamp(old, content_hash):
+        # Unchanged rows keep their version so delta queries skip them
+        return old[1] if old and old[0] == content_hash else version
+
+    events, markets, selections = {}, {}, {}
+    for competition in iter_competitions(payload):
+        for e in competition.get('events', []):
+            event_hash = _hash([competition.get('key'), competition.get('name')] + [
+                e.get(field) for field in ('key', 'name', 'home', 'away', 'status', 'cutoffTime')
+            ])
+            events[e['id']] = Event(
+                sport=sport,
+                cloudbet_id=e['id'],
+                key=e.get('key', ''),
+                name=e.get('name', ''),
+                competition_key=competition.get('key', ''),
+                competition_name=competition.get('name', ''),
+                home=e.get('home'),
+                away=e.get('away'),
+                status=e.get('status', ''),
+                cutoff_time=_parse_time(e.get('cutoffTime')),
+                version=stamp(old_events.get(e['id']), event_hash),
+                content_hash=event_hash
+            )
+            for market_key, market in (e.get('markets') or {}).items():
+                for submarket_key, submarket in (market.get('submarkets') or {}).items():
+                    market_hash = _hash(submarket.get('selections', []))
+                    markets[(e['id'], market_key, submarket_key)] = (
+                        str(submarket.get('sequence', '')),
+                        stamp(old_markets.get((e['id'], market_key, submarket_key)), market_hash),
+                        market_hash,
+                        submarket.get('selections', [])
+                    )
+
+    Event.objects.bulk_create(
+        events.values(), batch_size=BATCH_SIZE,
+        update_conflicts=True, unique_fields=['cloudbet_id'], update_fields=EVENT_FIELDS
+    )
+    event_ids = dict(
+        Event.objects.filter(sport=sport, updated_at__gte=started).values_list('cloudbet_id', 'id')
+    )
+
+    Market.objects.bulk_create(
+        [
+            Market(
+                event_id=event_ids[cloudbet_id], key=key, submarket_key=submarket_key,
+                sequence=sequence, version=market_version, content_hash=market_hash
+            )
+            for (cloudbet_id, key, submarket_key), (sequence, market_version, market_hash, _) in markets.items()
+        ],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True, unique_fields=['event', 'key', 'submarket_key'], update_fields=MARKET_FIELDS
+    )
+    market_ids = {
+        (event_id, key, submarket_key): market_id
+        for event_id, key, submarket_key, market_id in Market.objects.filter(
+            event__sport=sport, updated_at__gte=started
+        ).values_list('event_id', 'key', 'submarket_key', 'id')
+    }
+
+    for (cloudbet_id, key, submarket_key), (_, _, _, rows) in markets.items():
+        market_id = market_ids[(event_ids[cloudbet_id], key, submarket_key)]
+        for s in rows:
+            selections[(market_id, s.get('outcome', ''), s.get('params', ''))] = Selection(
+                market_id=market_id,
+                outcome=s.get('outcome', ''),
+                params=s.get('params', ''),
+                price=s.get('price'),
+                probability=s.get('probability'),
+                min_stake=s.get('minStake'),
+                max_stake=s.get('maxStake'),
+                status=s.get('status', ''),
+                side=s.get('side', '')
+            )
+    Selection.objects.bulk_create(
+        selections.values(), batch_size=BATCH_SIZE,
+        update_conflicts=True, unique_fields=['market', 'outcome', 'params'], update_fields=SELECTION_FIELDS
+    )
+
+    # Anything the upsert didn't touch is no longer offered upstream
+    removed_events = set(old_events) - set(events)
+    OddsRemoval.objects.bulk_create(
+        [OddsRemoval(sport=sport, version=version, event_id=cloudbet_id) for cloudbet_id in removed_events] + [
+            OddsRemoval(sport=sport, version=version, event_id=cloudbet_id,
+                        market_key=key, submarket_key=submarket_key)
+            for (cloudbet_id, key, submarket_key) in set(old_markets) - set(markets)
+            if cloudbet_id not in removed_events
+        ],
+        batch_size=BATCH_SIZE
+    )
+    Selection.objects.filter(market__event__sport=sport, updated_at__lt=started).delete()
+    Market.objects.filter(event__sport=sport, updated_at__lt=started).delete()
+    Event.objects.filter(sport=sport, updated_at__lt=started).delete()
+    return len(events)
+
+def _render(snapshot):
+    return {
+        'name': snapshot.name,
+        'key': snapshot.sport,
+        'competitions': _render_competitions(
+            Event.objects.filter(sport=snapshot.sport),
+            Market.objects.filter(event__sport=snapshot.sport)
+        ),
+        'refreshedAt': snapshot.refreshed_at.isoformat(),
+        'cursor': snapshot.version,
+    }
+
+def _render_delta(snapshot, since):
+    changed_markets = Market.objects.filter(event__sport=snapshot.sport, version__gt=since)
+    changed_events = Event.objects.filter(sport=snapshot.sport).filter(
+        Q(version__gt=since) | Q(id__in=changed_markets.values('event_id'))
+    )
+    removals = OddsRemoval.objects.filter(sport=snapshot.sport, version__gt=since)
+    return {
+        'name': snapshot.name,
+        'key': snapshot.sport,
+        'competitions': _render_competitions(changed_events, changed_markets),
+        'removed': {
+            'events': [r.event_id for r in removals if not r.market_key],
+            'markets': [
+                {'event': r.event_id, 'key': r.market_key, 'submarket': r.submarket_key}
+                for r in removals if r.market_key
+            ],
+        },
+        'refreshedAt': snapshot.refreshed_at.isoformat(),
+        'since': since,
+        'cursor': snapshot.version,
+    }
+
+def _render_competitions(events, markets):
+    selections = Selection.objects.filter(market__in=markets).values()
+    events = list(events.order_by('cutoff_time', 'id').values())
+    markets = list(markets.values('id', 'event_id', 'key', 'submarket_key', 'sequence'))
+
+    rendered_selections = {}
+    for s in selections:
+        rendered_selections.setdefault(s['market_id'], []).append({
+            'outcome': s['outcome'],
+            'params': s['params'],
+            'price': s['price'],
+            'probability': s['probability'],
+            'minStake': s['min_stake'],
+            'maxStake': s['max_stake'],
+            'status': s['status'],
+            'side': s['side'],
+        })
+
+    rendered_markets = {}
+    for m in markets:
+        submarkets = rendered_markets.setdefault(m['event_id'], {}).setdefault(m['key'], {'submarkets': {}})['submarkets']
+        submarkets[m['submarket_key']] = {
+            'sequence': m['sequence'],
+            'selections': rendered_selections.get(m['id'], []),
+        }
+
+    competitions = {}
+    for e in events:
+        competition = competitions.setdefault(e['competition_key'], {
+            'name': e['competition_name'],
+            'key': e['competition_key'],
+            'events': [],
+        })
+        competition['events'].append({
+            'id': e['cloudbet_id'],
+            'key': e['key'],
+            'name': e['name'],
+            'home': e['home'],
+            'away': e['away'],
+            'status': e['status'],
+            'cutoffTime': e['cutoff_time'].isoformat() if e['cutoff_time'] else None,
+            'markets': rendered_markets.get(e['id'], {}),
+        })
+    return list(competitions.values())
@@ -0,0 +1,148 @@
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from users import ledger
+from users.models import User
+from .models import Bet, UserBet
+from .settlement import PAYOUT_MULTIPLIER, BATCH_SIZE, settleable, still_open
+from . import activity, standings
+
+BET_TYPES = {'moneyline': 0, 'spread': 1, 'over/under': 2}
+CHOICES = {'home': 0, 'away': 1, 'over': 2, 'under': 3}
+BET_CHOICES = {'moneyline': ('home', 'away'), 'spread': ('home', 'away'), 'over/under': ('over', 'under')}
+WON, LOST, PUSH = 0, 1, 2
+RESULTS = {WON: 'won', LOST: 'lost', PUSH: 'push'}
+UPDATE_CHUNK = 5000
+
+def compute_results(bet_type, line, home_score, away_score, choice):
+    """Vectorized result of every wager (WON, LOST or PUSH).
+
+    All arguments are per-wager arrays. Moneyline bets go to the side with
+    more points. Spread lines are from the home side (home covers when
+    home + line > away). Over/under compares the total to the line. Exact
+    ties push. Unknown choices or bet types lose.
+    """
+    margin = home_score - away_score
+    total = home_score + away_score
+
+    # Signed score of the wager's side for its bet type; > 0 wins, == 0 pushes
+    edge = np.select(
+        [
+            (bet_type == 0) & (choice == 0),
+            (bet_type == 0) & (choice == 1),
+            (bet_type == 1) & (choice == 0),
+            (bet_type == 1) & (choice == 1),
+            (bet_type == 2) & (choice == 2),
+            (bet_type == 2) & (choice == 3),
+        ],
+        [margin, -margin, margin + line, -(margin + line), total - line, line - total],
+        default=-1
+    )
+    return np.where(edge > 0, WON, np.where(edge == 0, PUSH, LOST))
+
+def settle_scores(scores, batch_size=BATCH_SIZE):
+    """Settle bets from final scores {bet_id: (home_score, away_score)}.
+
+    Each batch loads its pending wagers into columnar arrays, computes
+    results and payouts with NumPy, then writes them back with a few bulk
+    UPDATEs, one bulk ledger insert and one standings update. Settled bets
+    are skipped, so re-runs are no-ops. Bets still taking wagers are
+    refused and counted as not_closed.
+    """
+    totals = {'bets': 0, 'won': 0, 'lost': 0, 'push': 0, 'users_credited': 0, 'not_closed': 0}
+    bet_ids = sorted(scores)
+    for start in range(0, len(bet_ids), batch_size):
+        with transaction.atomic():
+            batch = _settle_batch({bet_id: scores[bet_id] for bet_id in bet_ids[start:start + batch_size]})
+        for key, value in batch.items():
+            totals[key] += value
+    return totals
+
+def _settle_batch(scores):
+    now = timezone.now()
+    bets = list(
+        Bet.objects.select_for_update()
+        .filter(settleable(now), id__in=scores)
+        .order_by('id')
+        .values_list('id', 'group_id', 'type', 'points', 'line')
+    )
+    not_closed = still_open(scores, now)
+    if not bets:
+        return {'bets': 0, 'won': 0, 'lost': 0, 'push': 0, 'users_credited': 0, 'not_closed': not_closed}
+
+    bet_ids = np.array([b[0] for b in bets], dtype=np.int64)
+    bet_group = np.array([b[1] for b in bets], dtype=np.int64)
+    bet_type = np.array([BET_TYPES.get(b[2], -1) for b in bets], dtype=np.int8)
+    bet_line = np.array([b[3] if b[4] is None else b[4] for b in bets], dtype=np.float64)
+    bet_scores = np.array([scores[b[0]] for b in bets], dtype=np.int64).reshape(-1, 2)
+
+    wagers = list(
+        UserBet.objects.filter(bet_id__in=bet_ids.tolist(), result='pending')
+        .values_list('id', 'user_id', 'bet_id', 'choice', 'points_wagered')
+    )
+    if wagers:
+        wager_ids, user_ids, wager_bets, choices, stakes = zip(*wagers)
+        wager_ids = np.array(wager_ids, dtype=np.int64)
+        user_ids = np.array(user_ids, dtype=np.int64)
+        stakes = np.array(stakes, dtype=np.int64)
+        choice = np.array([CHOICES.get(c, -1) for c in choices], dtype=np.int8)
+        bet_index = np.searchsorted(bet_ids, np.array(wager_bets, dtype=np.int64))
+
+        results = compute_results(
+            bet_type[bet_index], bet_line[bet_index],
+            bet_scores[bet_index, 0], bet_scores[bet_index, 1], choice
+        )
+        payouts = np.select([results == WON, results == PUSH], [stakes * PAYOUT_MULTIPLIER, stakes], default=0)
+        groups = bet_group[bet_index]
+    else:
+        results = payouts = np.array([], dtype=np.int64)
+
+    counts = {'bets': len(bets), 'won': 0, 'lost': 0, 'push': 0, 'users_credited': 0, 'not_closed': not_closed}
+    for code, name in RESULTS.items():
+        ids = wager_ids[results == code].tolist() if wagers else []
+        counts[name] = len(ids)
+        for i in range(0, len(ids), UPDATE_CHUNK):
+            UserBet.objects.filter(id__in=ids[i:i + UPDATE_CHUNK]).update(result=name)
+
+    if wagers:
+        # Credit each user once with the sum of their payouts
+        paid = payouts > 0
+        credited_users, inverse = np.unique(user_ids[paid], return_inverse=True)
+        credits = np.bincount(inverse, weights=payouts[paid]).astype(np.int64)
+        users = [User(id=user_id, points=F('points') + credit)
+                 for user_id, credit in zip(credited_users.tolist(), credits.tolist())]
+        User.objects.bulk_update(users, ['points'], batch_size=UPDATE_CHUNK)
+        counts['users_credited'] = len(users)
+
+        kinds = np.where(results == WON, 'payout', 'refund')
+        ledger.record_many(
+            (user_id, payout, kind, wager_id)
+            for user_id, payout, kind, wager_id in zip(
+                user_ids[paid].tolist(), payouts[paid].tolist(), kinds[paid].tolist(), wager_ids[paid].tolist()
+            )
+        )
+        standings.apply_settlement(_standings_rows(groups, user_ids, results, stakes))
+
+    Bet.objects.filter(id__in=bet_ids.tolist()).update(status='settled')
+    activity.record_settlements(zip(bet_ids.tolist(), bet_group.tolist()))
+    return counts
+
+def _standings_rows(groups, user_ids, results, stakes):
+    pairs, inverse = np.unique(np.stack([groups, user_ids], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+
+    def per_pair(mask, weights=None):
+        return np.bincount(inverse[mask], weights=None if weights is None else weights[mask],
+                           minlength=len(pairs)).astype(np.int64)
+
+    won, lost, push = results == WON, results == LOST, results == PUSH
+    columns = zip(
+        pairs.tolist(), per_pair(won, stakes).tolist(), per_pair(won).tolist(),
+        per_pair(lost, stakes).tolist(), per_pair(lost).tolist(), per_pair(push, stakes).tolist()
+    )
+    return [
+        {'group_id': group_id, 'user_id': user_id, 'won_points': won_points, 'wins': wins,
+         'lost_points': lost_points, 'losses': losses, 'pushed_points': pushed_points}
+        for (group_id, user_id), won_points, wins, lost_points, losses, pushed_points in columns
+    ]
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import BettingGroup, Bet
+from .models import BettingGroup, Bet, GroupActivity
 from users.serializers import UserSerializer
 
 class BettingGroupSerializer(serializers.ModelSerializer):
@@ -19,7 +19,24 @@ class BettingGroupSerializer(serializers.ModelSerializer):
             group.members.add(member)
         return group
 
+class BettingGroupSummarySerializer(serializers.ModelSerializer):
+    """Group list entry with a member count instead of every member"""
+    president = UserSerializer(read_only=True)
+    member_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = BettingGroup
+        fields = ['id', 'name', 'description', 'sports', 'president', 'member_count', 'created_at']
+
 class BetSerializer(serializers.ModelSerializer):
     class Meta:
         model = Bet
-        fields = ('id', 'name', 'type', 'points', 'status', 'deadline') 
\ No newline at end of file
+        fields = ('id', 'name', 'type', 'points', 'status', 'deadline') 
+
+class GroupActivitySerializer(serializers.ModelSerializer):
+    actor = serializers.CharField(source='actor.username', default=None, read_only=True)
+    bet_name = serializers.CharField(source='bet.name', default=None, read_only=True)
+
+    class Meta:
+        model = GroupActivity
+        fields = ('id', 'kind', 'actor', 'bet_id', 'bet_name', 'points', 'created_at')
@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from users import ledger
+from users.models import User
+from .models import Bet, UserBet
+from . import activity, standings
+
+PAYOUT_MULTIPLIER = 2  # Winners get their stake back plus an equal amount
+BATCH_SIZE = 500
+
+def settleable(now):
+    """Bets whose wagering is over: closed by the sweeper, or still open but past the deadline"""
+    return Q(status='closed') | Q(status='open', deadline__lte=now)
+
+def still_open(bet_ids, now):
+    """How many of bet_ids are still taking wagers, and so were refused"""
+    return Bet.objects.filter(id__in=bet_ids, status='open', deadline__gt=now).count()
+
+def settle_bets(outcomes, batch_size=BATCH_SIZE):
+    """Settle bets given {bet_id: winning_choice}.
+
+    Each batch runs in one transaction with a handful of set-based UPDATEs:
+    credit winners' points, mark winning and losing wagers, then mark the
+    bets settled. Payouts are appended to the points ledger in bulk and
+    group standings are bumped in one bulk UPDATE. Bets that are already
+    settled are skipped and only pending wagers are touched, so re-running
+    with the same outcomes is a no-op. Bets still taking wagers are refused
+    and counted as not_closed.
+    """
+    totals = {'bets': 0, 'won': 0, 'lost': 0, 'users_credited': 0, 'not_closed': 0}
+    bet_ids = sorted(outcomes)
+    for start in range(0, len(bet_ids), batch_size):
+        with transaction.atomic():
+            batch = _settle_batch({bet_id: outcomes[bet_id] for bet_id in bet_ids[start:start + batch_size]})
+        for key, value in batch.items():
+            totals[key] += value
+    return totals
+
+def _settle_batch(outcomes):
+    now = timezone.now()
+    # Bet rows are locked before user rows, as in place_wager, so the two never deadlock
+    bets = list(
+        Bet.objects.select_for_update()
+        .filter(settleable(now), id__in=outcomes)
+        .order_by('id')
+        .values_list('id', 'group_id')
+    )
+    bet_ids = [bet_id for bet_id, _ in bets]
+    not_closed = still_open(outcomes, now)
+    if not bet_ids:
+        return {'bets': 0, 'won': 0, 'lost': 0, 'users_credited': 0, 'not_closed': not_closed}
+
+    bets_by_choice = {}
+    for bet_id in bet_ids:
+        bets_by_choice.setdefault(outcomes[bet_id], []).append(bet_id)
+    winning_filter = Q()
+    for choice, ids in bets_by_choice.items():
+        winning_filter |= Q(bet_id__in=ids, choice=choice)
+
+    pending = UserBet.objects.filter(bet_id__in=bet_ids, result='pending')
+    winning = pending.filter(winning_filter)
+
+    standings.apply_settlement(
+        pending.values('user_id', group_id=F('bet__group_id')).annotate(
+            won_points=Coalesce(Sum('points_wagered', filter=winning_filter), Value(0)),
+            wins=Count('id', filter=winning_filter),
+            lost_points=Coalesce(Sum('points_wagered', filter=~winning_filter), Value(0)),
+            losses=Count('id', filter=~winning_filter)
+        )
+    )
+    payout = winning.filter(user_id=OuterRef('pk')).values('user_id').annotate(
+        total=Sum('points_wagered') * PAYOUT_MULTIPLIER
+    ).values('total')
+    users_credited = User.objects.filter(id__in=winning.values('user_id')).update(
+        points=F('points') + Subquery(payout)
+    )
+    # Ledger ids are taken after the user rows are locked, as in payouts and wagers,
+    # so one user's entries commit in id order
+    ledger.record_many(
+        (user_id, points_wagered * PAYOUT_MULTIPLIER, 'payout', wager_id)
+        for wager_id, user_id, points_wagered in winning.values_list('id', 'user_id', 'points_wagered').iterator()
+    )
+    won = winning.update(result='won')
+    lost = pending.update(result='lost')  # Whatever is still pending lost
+    Bet.objects.filter(id__in=bet_ids).update(status='settled')
+    activity.record_settlements(bets)
+
+    return {'bets': len(bet_ids), 'won': won, 'lost': lost, 'users_credited': users_credited, 'not_closed': not_closed}
@@ -0,0 +1,114 @@
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import GroupStanding
+
+MAX_LIMIT = 100
+
+def add_members(group_id, user_ids):
+    """Give new members an empty standing; existing rows are left alone"""
+    GroupStanding.objects.bulk_create(
+        [GroupStanding(group_id=group_id, user_id=user_id) for user_id in user_ids],
+        ignore_conflicts=True
+    )
+
+def record_wager(group_id, user_id, points_wagered):
+    """Add a freshly placed wager to the member's pending exposure"""
+    updated = GroupStanding.objects.filter(group_id=group_id, user_id=user_id).update(
+        pending_exposure=F('pending_exposure') + points_wagered,
+        updated_at=timezone.now()
+    )
+    if not updated:
+        # ignore_conflicts lets a concurrent wager create the row first; either way it is then bumped
+        GroupStanding.objects.bulk_create([GroupStanding(group_id=group_id, user_id=user_id)], ignore_conflicts=True)
+        GroupStanding.objects.filter(group_id=group_id, user_id=user_id).update(
+            pending_exposure=F('pending_exposure') + points_wagered,
+            updated_at=timezone.now()
+        )
+
+def apply_settlement(rows):
+    """Fold settled wagers into standings.
+
+    rows are dicts with group_id, user_id, won_points, wins, lost_points,
+    losses and optionally pushed_points (refunded stakes), one per member
+    per settlement batch. Existing standings are bumped with F()
+    expressions in one bulk UPDATE.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    existing = {
+        (s.group_id, s.user_id): s
+        for s in GroupStanding.objects.filter(
+            group_id__in={r['group_id'] for r in rows},
+            user_id__in={r['user_id'] for r in rows}
+        ).only('id', 'group_id', 'user_id')
+    }
+
+    now = timezone.now()
+    to_update, to_create = [], []
+    for r in rows:
+        standing = existing.get((r['group_id'], r['user_id']))
+        if standing is None:
+            to_create.append(GroupStanding(
+                group_id=r['group_id'], user_id=r['user_id'],
+                points_won=r['won_points'], points_lost=r['lost_points'],
+                net=r['won_points'] - r['lost_points'], wins=r['wins'], losses=r['losses']
+            ))
+            continue
+        standing.points_won = F('points_won') + r['won_points']
+        standing.points_lost = F('points_lost') + r['lost_points']
+        standing.net = F('net') + r['won_points'] - r['lost_points']
+        standing.wins = F('wins') + r['wins']
+        standing.losses = F('losses') + r['losses']
+        standing.pending_exposure = (
+            F('pending_exposure') - r['won_points'] - r['lost_points'] - r.get('pushed_points', 0)
+        )
+        standing.updated_at = now
+        to_update.append(standing)
+
+    GroupStanding.objects.bulk_update(
+        to_update,
+        ['points_won', 'points_lost', 'net', 'wins', 'losses', 'pending_exposure', 'updated_at'],
+        batch_size=1000
+    )
+    GroupStanding.objects.bulk_create(to_create)
+
+def leaderboard(group_id, user_id, limit=10, window=0):
+    """Top `limit` members, plus `window` members either side of `user_id`.
+
+    Every query is a range over the (group, -net, user) index, so the cost
+    depends on the group's size, never on how many bets it has settled.
+    """
+    standings = GroupStanding.objects.filter(group_id=group_id).select_related('user')
+    result = {'top': [_row(s, rank) for rank, s in enumerate(standings.order_by('-net', 'user_id')[:limit], 1)]}
+
+    me = standings.filter(user_id=user_id).first()
+    if me is None:
+        result['me'] = None
+        return result
+
+    ahead = Q(net__gt=me.net) | Q(net=me.net, user_id__lt=me.user_id)
+    rank = standings.filter(ahead).count() + 1
+    result['me'] = _row(me, rank)
+    if window:
+        above = list(standings.filter(ahead).order_by('net', '-user_id')[:window])[::-1]
+        below = standings.exclude(ahead).exclude(id=me.id).order_by('-net', 'user_id')[:window]
+        result['around_me'] = (
+            [_row(s, rank - len(above) + i) for i, s in enumerate(above)]
+            + [result['me']]
+            + [_row(s, rank + 1 + i) for i, s in enumerate(below)]
+        )
+    return result
+
+def _row(standing, rank):
+    return {
+        'rank': rank,
+        'user_id': standing.user_id,
+        'username': standing.user.username,
+        'net': standing.net,
+        'points_won': standing.points_won,
+        'points_lost': standing.points_lost,
+        'wins': standing.wins,
+        'losses': standing.losses,
+        'pending_exposure': standing.pending_exposure,
+    }
@@ -0,0 +1,62 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from users.models import Notification
+from .models import Bet, BettingGroup
+
+def close_expired(now=None, batch_size=None):
+    """Close open bets whose deadline has passed, in batches.
+
+    Each batch is an index range scan over (status, deadline) followed by
+    one UPDATE, so a sweep only touches rows that are due. Returns the
+    number of bets closed.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or settings.BET_SWEEP_BATCH_SIZE
+    due = Bet.objects.filter(status='open', deadline__lte=now)
+    closed = 0
+    while True:
+        ids = list(due.order_by('deadline', 'id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return closed
+        # Re-check status so a bet settled mid-sweep is left alone
+        closed += Bet.objects.filter(id__in=ids, status='open').update(status='closed')
+
+def notify_closing_soon(now=None, window=None):
+    """Tell group members about open bets closing within `window` seconds.
+
+    Notifications for the whole sweep go in with one bulk insert and each
+    bet is flagged so members are only told once. Returns the number of
+    notifications sent.
+    """
+    now = now or timezone.now()
+    window = timedelta(seconds=window or settings.BET_CLOSING_SOON_WINDOW)
+    with transaction.atomic():
+        bets = list(
+            Bet.objects.select_for_update(skip_locked=True)
+            .filter(status='open', closing_notified=False, deadline__gt=now, deadline__lte=now + window)
+            .values_list('id', 'group_id', 'name')
+        )
+        if not bets:
+            return 0
+
+        members = {}
+        for group_id, user_id in BettingGroup.members.through.objects.filter(
+            bettinggroup_id__in={group_id for _, group_id, _ in bets}
+        ).values_list('bettinggroup_id', 'user_id'):
+            members.setdefault(group_id, []).append(user_id)
+
+        notifications = [
+            Notification(
+                user_id=user_id,
+                message=f'Bet "{name}" closes soon',
+                notification_type='bet_closing',
+                reference_id=bet_id
+            )
+            for bet_id, group_id, name in bets
+            for user_id in members.get(group_id, [])
+        ]
+        Notification.objects.bulk_create(notifications, batch_size=1000)
+        Bet.objects.filter(id__in=[bet_id for bet_id, _, _ in bets]).update(closing_notified=True)
+    return len(notifications)
@@ -5,12 +5,19 @@ urlpatterns = [
     path('groups/', views.get_groups),
     path('groups/create/', views.CreateGroupView.as_view()),
     path('groups/<int:group_id>/', views.get_group),
+    path('groups/<int:group_id>/bets/', views.get_group_bets, name='get_group_bets'),
+    path('groups/<int:group_id>/bets/import/', views.import_group_bets, name='import_group_bets'),
+    path('groups/<int:group_id>/activity/', views.get_group_activity, name='get_group_activity'),
+    path('groups/<int:group_id>/leaderboard/', views.get_group_leaderboard, name='get_group_leaderboard'),
     path('groups/<int:group_id>/add-member/<int:user_id>/', views.add_group_member, name='add_group_member'),
+    path('groups/<int:group_id>/invite/', views.invite_many_to_group, name='invite_many_to_group'),
     path('groups/<int:group_id>/invite/<int:user_id>/', views.invite_to_group),
     path('group-invites/<int:invite_id>/handle/', views.handle_group_invite),
+    path('bets/<int:bet_id>/wager/', views.create_wager, name='create_wager'),
     
     # Move bets under groups/
     path('groups/bets/test/', views.test_bets_endpoint, name='test_bets'),
+    path('groups/bets/cache-stats/', views.get_odds_cache_stats, name='odds_cache_stats'),
     path('groups/bets/', views.get_available_bets, name='get_available_bets'),
     path('groups/bets/<str:sport>/', views.get_available_bets, name='get_sport_bets'),
 ] 
\ No newline at end of file
@@ -1,21 +1,38 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection, transaction
+from django.db.models import Count
 from rest_framework import status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from .models import BettingGroup, User, GroupInvite
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from .models import BettingGroup, GroupActivity, User, GroupInvite
 from users.models import Notification  # Import from users app instead
-from .serializers import BettingGroupSerializer
-from .cloudbet import CloudbetClient
+from users import outbox, unread_counts
+from .serializers import BettingGroupSerializer, BettingGroupSummarySerializer, GroupActivitySerializer
+from roster_royals.pagination import InvalidCursor, keyset_page, wants_page
+from .cloudbet import CloudbetClient, CloudbetUnavailable
+from .odds_cache import odds_cache
+from . import group_cache, odds_store, standings
+from .odds_query import InvalidQuery, apply_query, etag_for, etag_matches
+from .wagers import WagerError, place_wager
+from .bet_import import import_bets
+from .invites import MAX_BATCH as MAX_INVITE_BATCH, invite_users
+from .membership import member_joined
+
+logger = logging.getLogger(__name__)
 
 class CreateGroupView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = BettingGroupSerializer
 
     def perform_create(self, serializer):
-        # Create group with current user as president
-        group = serializer.save(president=self.request.user)
-        # Add president as first member
-        group.members.add(self.request.user)
+        with transaction.atomic():
+            # Create group with current user as president
+            group = serializer.save(president=self.request.user)
+            # Add president as first member
+            group.members.add(self.request.user)
+            member_joined(group.id, [self.request.user.id])
         return group
 
 @api_view(['POST'])
@@ -24,7 +41,9 @@ def add_group_member(request, group_id, user_id):
     try:
         group = BettingGroup.objects.get(id=group_id, president=request.user)
         user = User.objects.get(id=user_id)
-        group.members.add(user)
+        with transaction.atomic():
+            group.members.add(user)
+            member_joined(group.id, [user.id])
         return Response({'message': 'Member added successfully'})
     except BettingGroup.DoesNotExist:
         return Response({'error': 'Group not found or not authorized'}, status=404)
@@ -34,69 +53,68 @@ def add_group_member(request, group_id, user_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_groups(request):
-    user = request.user
-    groups = BettingGroup.objects.filter(members=user)
-    return Response(BettingGroupSerializer(groups, many=True).data)
+    # Filter through a subquery so the members join doesn't skew member_count
+    groups = BettingGroup.objects.filter(id__in=request.user.betting_groups.values('id')).select_related('president')
+    if request.GET.get('summary') in ('1', 'true'):
+        groups = groups.annotate(member_count=Count('members'))
+        serializer_class = BettingGroupSummarySerializer
+    else:
+        groups = groups.prefetch_related('members')
+        serializer_class = BettingGroupSerializer
+
+    if not wants_page(request):
+        return Response(serializer_class(groups, many=True).data)
+    try:
+        page, next_cursor = keyset_page(groups, request)
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=400)
+    return Response({'results': serializer_class(page, many=True).data, 'next_cursor': next_cursor})
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def invite_to_group(request, group_id, user_id):
-    print(f"\nProcessing group invite:")
-    print(f"- From: {request.user.username}")
-    print(f"- Group ID: {group_id}")
-    print(f"- To User ID: {user_id}")
-    
     try:
         group = BettingGroup.objects.get(id=group_id)
         to_user = User.objects.get(id=user_id)
-        
-        print(f"Found group '{group.name}' and user '{to_user.username}'")
-        
+
         # Check if user is president
         if request.user != group.president:
-            print(f"ERROR: {request.user.username} is not president of this group")
             return Response({'error': 'Only group president can invite members'}, status=403)
-        
-        # Create invite
-        invite = GroupInvite.objects.create(
-            group=group,
-            to_user=to_user,
-            status='pending'
-        )
-        print(f"Created GroupInvite with ID: {invite.id}")
-
-        # Create notification
-        notification = Notification.objects.create(
-            user=to_user,
-            message=f"{request.user.username} invited you to join {group.name}",
-            notification_type='group_invite',
-            requires_action=True,
-            reference_id=invite.id
-        )
-        print(f"""
-        Created Notification:
-        - ID: {notification.id}
-        - Type: {notification.notification_type}
-        - For User: {notification.user.username}
-        - Message: {notification.message}
-        - Requires Action: {notification.requires_action}
-        - Reference ID: {notification.reference_id}
-        """)
-        
-        # Verify notification exists
-        verify = Notification.objects.get(id=notification.id)
-        print(f"Verified notification exists with ID {verify.id}")
-        
+
+        invites, _, _ = invite_users(group, request.user, [to_user.id])
+        if not invites:
+            return Response({'error': 'User is already a member or has been invited'}, status=400)
+
         return Response({
             'message': 'Invite sent successfully',
-            'invite_id': invite.id,
-            'notification_id': notification.id
+            'invite_id': invites[0].id
         })
-        
+
     except Exception as e:
-        print(f"ERROR: {str(e)}")
         return Response({'error': str(e)}, status=500)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def invite_many_to_group(request, group_id):
+    try:
+        group = BettingGroup.objects.get(id=group_id, president=request.user)
+    except BettingGroup.DoesNotExist:
+        return Response({'error': 'Group not found or not authorized'}, status=404)
+
+    user_ids = request.data.get('user_ids')
+    if (not isinstance(user_ids, list) or not user_ids
+            or not all(isinstance(user_id, int) for user_id in user_ids)):
+        return Response({'error': 'user_ids must be a non-empty list of integers'}, status=400)
+    if len(user_ids) > MAX_INVITE_BATCH:
+        return Response({'error': f'At most {MAX_INVITE_BATCH} users per request'}, status=400)
+
+    invites, skipped, not_found = invite_users(group, request.user, user_ids)
+    return Response({
+        'invited': [{'user_id': invite.to_user_id, 'invite_id': invite.id} for invite in invites],
+        'skipped': skipped,
+        'not_found': not_found
+    }, status=status.HTTP_201_CREATED if invites else status.HTTP_200_OK)
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def handle_group_invite(request, invite_id):
@@ -109,23 +127,21 @@ def handle_group_invite(request, invite_id):
         action = request.data.get('action')
         
         if action == 'accept':
-            invite.status = 'accepted'
-            invite.save()
-            invite.group.members.add(request.user)
-            
-            # Create notification for group president
-            Notification.objects.create(
-                user=invite.group.president,
-                message=f"{request.user.username} joined {invite.group.name}",
-                notification_type='info'
-            )
-            
-            # Delete the invitation notification
-            Notification.objects.filter(
-                user=request.user,
-                notification_type='group_invite',
-                requires_action=True
-            ).delete()
+            with transaction.atomic():
+                invite.status = 'accepted'
+                invite.save()
+                invite.group.members.add(request.user)
+                member_joined(invite.group_id, [request.user.id])
+                # Notify the group president
+                outbox.record('group_joined', group_id=invite.group_id, user_id=request.user.id)
+
+                # Delete the invitation notification
+                Notification.objects.filter(
+                    user=request.user,
+                    notification_type='group_invite',
+                    reference_id=invite.id
+                ).delete()
+            unread_counts.forget(request.user.id)
             
             return Response({'message': 'Invite accepted'})
             
@@ -137,8 +153,9 @@ def handle_group_invite(request, invite_id):
             Notification.objects.filter(
                 user=request.user,
                 notification_type='group_invite',
-                requires_action=True
+                reference_id=invite.id
             ).delete()
+            unread_counts.forget(request.user.id)
             
             return Response({'message': 'Invite rejected'})
             
@@ -148,49 +165,177 @@ def handle_group_invite(request, invite_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_group(request, group_id):
-    print(f"\nFetching group details:")
-    print(f"- Group ID: {group_id}")
-    print(f"- User: {request.user.username}")
-    
-    try:
-        group = BettingGroup.objects.get(id=group_id)
-        print(f"Found group: {group.name}")
-        serialized_data = BettingGroupSerializer(group).data
-        print(f"Serialized data: {serialized_data}")
-        return Response(serialized_data)
-    except BettingGroup.DoesNotExist:
-        print(f"Group {group_id} not found")
+    detail = group_cache.get_detail(group_id)
+    if detail is None:
         return Response({'error': 'Group not found'}, status=404)
-    except Exception as e:
-        print(f"Error: {str(e)}")
-        return Response({'error': str(e)}, status=500)
+    payload, etag = detail
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        return Response(status=304, headers={'ETag': etag})
+    return Response(payload, headers={'ETag': etag})
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_available_bets(request, sport=None):
+    since = request.GET.get('since')
+    if since is not None and not since.isdigit():
+        return Response({'error': 'since must be a cursor returned by this endpoint'}, status=400)
+
     try:
-        print("\nDEBUG: Fetching bets")
-        print(f"Sport param: {sport}")
-        
-        client = CloudbetClient()
         if sport:
-            print(f"Fetching events for sport: {sport}")
-            events = client.get_events(sport)
-            print(f"Events response: {events}")
-            return Response(events)
+            events = odds_store.get_events(sport, int(since) if since else None)
+            if events is None:  # Not ingested yet, proxy through the cache
+                events = odds_cache.get_events(sport)
+
+            etag = etag_for(sport, events, request.GET)
+            if etag_matches(request.headers.get('If-None-Match'), etag):
+                return Response(status=304, headers={'ETag': etag})
+            return Response(apply_query(events, request.GET), headers={'ETag': etag})
         else:
-            print("Fetching all sports")
-            sports = client.get_sports()
-            print(f"Sports response: {sports}")
+            sports = odds_store.get_sports()
+            if sports is None:
+                sports = odds_cache.get_sports()
             return Response(sports)
             
+    except InvalidQuery as e:
+        return Response({'error': str(e)}, status=400)
+    except CloudbetUnavailable as e:
+        return Response({'error': str(e)}, status=503)
     except Exception as e:
-        print(f"ERROR in get_available_bets: {str(e)}")
-        print(f"Error type: {type(e)}")
+        logger.exception('get_available_bets failed for sport %s', sport)
         return Response({'error': str(e)}, status=500)
 
+def fetch_sport_events(sport, since=None):
+    """Events for a sport from the local store, proxied through the cache if never ingested"""
+    try:
+        events = odds_store.get_events(sport, since)
+        if events is None:
+            events = odds_cache.get_events(sport)
+        return events
+    finally:
+        connection.close()  # Worker threads don't get Django's end-of-request cleanup
+
+def resolve_sport_key(sport):
+    """Map a group's sport entry (key or display name like 'NFL') to a Cloudbet key"""
+    if sport in CloudbetClient.SUPPORTED_SPORTS:
+        return sport
+    for key, name in CloudbetClient.SUPPORTED_SPORTS.items():
+        if name.lower() == str(sport).lower():
+            return key
+    return None
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_group_bets(request, group_id):
+    try:
+        group = BettingGroup.objects.get(id=group_id, members=request.user)
+    except BettingGroup.DoesNotExist:
+        return Response({'error': 'Group not found'}, status=404)
+
+    sports, errors = {}, {}
+    for sport in group.sports:
+        key = resolve_sport_key(sport)
+        if key:
+            sports[key] = sport
+        else:
+            errors[str(sport)] = 'Unsupported sport'
+
+    # ?since=soccer:12,basketball:40 takes the per-sport cursors of an earlier response
+    cursors = {}
+    for part in filter(None, request.GET.get('since', '').split(',')):
+        key, _, cursor = part.partition(':')
+        if not cursor.isdigit():
+            return Response({'error': 'since must look like sport:cursor,...'}, status=400)
+        cursors[key] = int(cursor)
+
+    results = {}
+    if sports:
+        # Fetch every sport at once so latency tracks the slowest one, not the sum
+        with ThreadPoolExecutor(max_workers=len(sports)) as executor:
+            futures = {key: executor.submit(fetch_sport_events, key, cursors.get(key)) for key in sports}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                errors[key] = str(e)
+
+    return Response({
+        'group_id': group.id,
+        'sports': results,
+        'errors': errors
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_wager(request, bet_id):
+    try:
+        wager = place_wager(
+            request.user,
+            bet_id,
+            request.data.get('choice'),
+            request.data.get('points_wagered')
+        )
+    except WagerError as e:
+        return Response({'error': str(e)}, status=e.status)
+
+    return Response({
+        'message': 'Wager placed',
+        'wager_id': wager.id,
+        'choice': wager.choice,
+        'points_wagered': wager.points_wagered
+    }, status=status.HTTP_201_CREATED)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_group_bets(request, group_id):
+    try:
+        group = BettingGroup.objects.get(id=group_id, president=request.user)
+    except BettingGroup.DoesNotExist:
+        return Response({'error': 'Group not found or not authorized'}, status=404)
+
+    items = request.data.get('markets')
+    if not isinstance(items, list) or not items:
+        return Response({'error': 'markets must be a non-empty list'}, status=400)
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get('event_id'), int) or not item.get('market'):
+            return Response({'error': 'Each market needs an integer event_id and a market key'}, status=400)
+
+    created, skipped, errors = import_bets(group, items, request.user.id)
+    return Response({
+        'created': len(created),
+        'skipped': len(skipped),
+        'errors': errors
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_group_activity(request, group_id):
+    if not BettingGroup.objects.filter(id=group_id, members=request.user).exists():
+        return Response({'error': 'Group not found'}, status=404)
+    entries = GroupActivity.objects.filter(group_id=group_id).select_related('actor', 'bet')
+    try:
+        page, next_cursor = keyset_page(entries, request)
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=400)
+    return Response({'results': GroupActivitySerializer(page, many=True).data, 'next_cursor': next_cursor})
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_group_leaderboard(request, group_id):
+    if not BettingGroup.objects.filter(id=group_id, members=request.user).exists():
+        return Response({'error': 'Group not found'}, status=404)
+    try:
+        limit = min(int(request.GET.get('limit', 10)), standings.MAX_LIMIT)
+        window = min(int(request.GET.get('around_me', 0)), standings.MAX_LIMIT)
+    except ValueError:
+        return Response({'error': 'limit and around_me must be integers'}, status=400)
+    return Response(standings.leaderboard(group_id, request.user.id, max(limit, 0), max(window, 0)))
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_odds_cache_stats(request):
+    return Response(odds_cache.stats())
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def test_bets_endpoint(request):
-    print("Test endpoint hit!")
     return Response({"message": "Test endpoint working"}) 
\ No newline at end of file
@@ -0,0 +1,68 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from users import ledger
+from users.models import User
+from .models import Bet, UserBet
+from .payouts import BET_CHOICES
+from . import activity, standings
+
+class WagerError(Exception):
+    """A wager was refused; status is the HTTP status to answer with"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def place_wager(user, bet_id, choice, points_wagered):
+    """Place a wager, reserving the points with one conditional UPDATE.
+
+    The balance check and deduction happen in the same statement, so two
+    concurrent wagers can never overdraw a user. The ('user', 'bet') unique
+    constraint rejects duplicates, rolling the deduction back. Each
+    transaction locks the bet row and then the user's own row, the same
+    order settlement uses, so wagers and settlement never deadlock and a
+    wager can't be placed on a bet while it is being settled. Wagers on
+    one bet are therefore serialized.
+    """
+    if not isinstance(choice, str) or not choice:
+        raise WagerError('A choice is required')
+    if not isinstance(points_wagered, int) or isinstance(points_wagered, bool) or points_wagered <= 0:
+        raise WagerError('points_wagered must be a positive integer')
+
+    with transaction.atomic():
+        # Lock the bet before the user row, in the same order as settlement, so a
+        # wager can't land on a bet being settled and the two never deadlock
+        bet = (Bet.objects.select_for_update(of=('self',)).filter(id=bet_id, group__members=user)
+               .values('group_id', 'type', 'status', 'deadline').first())
+        if bet is None:
+            raise WagerError('Bet not found', 404)
+        # Only choices compute_results can settle; anything else would silently lose
+        choices = BET_CHOICES.get(bet['type'], ())
+        if choice not in choices:
+            raise WagerError(f'choice must be one of: {", ".join(choices)}')
+        if bet['status'] != 'open' or bet['deadline'] <= timezone.now():
+            raise WagerError('Bet is closed', 409)
+
+        reserved = User.objects.filter(id=user.id, points__gte=points_wagered).update(
+            points=F('points') - points_wagered
+        )
+        if not reserved:
+            raise WagerError('Not enough points', 409)
+
+        try:
+            with transaction.atomic():
+                wager = UserBet.objects.create(
+                    user_id=user.id,
+                    bet_id=bet_id,
+                    choice=choice,
+                    points_wagered=points_wagered
+                )
+        except IntegrityError:
+            if UserBet.objects.filter(user_id=user.id, bet_id=bet_id).exists():
+                raise WagerError('You already placed a wager on this bet', 409)
+            raise
+        ledger.record(user.id, -points_wagered, 'wager', wager.id)
+        standings.record_wager(bet['group_id'], user.id, points_wagered)
+        activity.record(bet['group_id'], 'wager_placed', user.id, bet_id, points_wagered)
+        return wager
\ No newline at end of file
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+class LocalBackend:
+    """Delivers messages to subscribers in this process only"""
+    _deliver = None
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, channel, message):
+        if self._deliver is not None:  # Nothing has subscribed in this process yet
+            self._deliver(channel, message)
+
+class RedisBackend:
+    """Fans messages out to every process through Redis pub/sub.
+
+    Each process runs one listener thread on a pattern subscription, so the
+    number of Redis connections doesn't grow with the number of clients.
+    """
+    PREFIX = 'broadcast:'
+
+    def __init__(self, url):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+
+    def start(self, deliver):
+        threading.Thread(target=self._listen, args=(deliver,), daemon=True, name='broadcast-listener').start()
+
+    def publish(self, channel, message):
+        self._redis.publish(self.PREFIX + channel, json.dumps(message, default=str))
+
+    def _listen(self, deliver):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(self.PREFIX + '*')
+                for item in pubsub.listen():
+                    deliver(item['channel'].decode().removeprefix(self.PREFIX), json.loads(item['data']))
+            except Exception:
+                logger.exception('Broadcast listener lost its Redis connection, reconnecting')
+                time.sleep(1)
+
+class Subscription:
+    """A connection's bounded message queue; a slow client loses messages, not memory"""
+
+    def __init__(self, channels):
+        self.channels = channels
+        self.overflowed = False
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=settings.BROADCAST_QUEUE_SIZE)
+
+    def put(self, message):
+        # Called from publisher threads
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            pass  # Event loop already closed, the stream is gone
+
+    async def get(self):
+        return await self._queue.get()
+
+    def _put(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+class Broadcaster:
+    """In-process pub/sub between publishers (views, commands) and open streams.
+
+    Publishing goes through the backend so other processes hear about it
+    too; delivery to local subscribers is a dict lookup and a queue put,
+    so thousands of idle connections cost one small queue each.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+        self._started = False
+
+    def publish(self, channel, message):
+        """Publish once the current transaction commits, so readers see the rows"""
+        transaction.on_commit(lambda: self._publish(channel, message))
+
+    def publish_many(self, messages):
+        messages = list(messages)
+        if messages:
+            transaction.on_commit(lambda: [self._publish(channel, message) for channel, message in messages])
+
+    def subscribe(self, channels):
+        self._start()
+        subscription = Subscription(channels)
+        with self._lock:
+            for channel in channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def _publish(self, channel, message):
+        try:
+            self._backend.publish(channel, message)
+        except Exception:
+            # Pushes are best effort, clients catch up from the REST endpoints
+            logger.exception('Failed to publish to %s', channel)
+
+    def _deliver(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+
+    def _start(self):
+        if self._started:
+            return
+        with self._lock:
+            if not self._started:
+                self._backend.start(self._deliver)
+                self._started = True
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+def odds_channel(sport):
+    return f'odds:{sport}'
+
+def _backend():
+    if settings.BROADCAST_BACKEND == 'redis':
+        return RedisBackend(settings.BROADCAST_REDIS_URL)
+    return LocalBackend()
+
+broadcaster = Broadcaster(_backend())
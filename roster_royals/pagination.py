@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+from django.db.models import Q
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+class InvalidCursor(ValueError):
+    pass
+
+def wants_page(request):
+    """Pagination is opt-in so existing clients keep getting plain lists"""
+    return 'cursor' in request.GET or 'limit' in request.GET
+
+def keyset_page(queryset, request, field='created_at', max_limit=MAX_LIMIT):
+    """Newest-first page of `queryset` keyed on (field, id).
+
+    The cursor holds the last row's (field, id), so each page is a range
+    scan from that point instead of an OFFSET over every earlier row, and
+    rows inserted meanwhile never shift a page. Returns (rows, next_cursor)
+    where next_cursor is None on the last page.
+    """
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise InvalidCursor('limit must be an integer')
+    limit = min(max(limit, 1), max_limit)
+
+    queryset = queryset.order_by(f'-{field}', '-id')
+    cursor = request.GET.get('cursor')
+    if cursor:
+        value, last_id = _decode(cursor)
+        queryset = queryset.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': last_id}))
+
+    rows = list(queryset[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, _encode(getattr(rows[-1], field), rows[-1].id)
+
+def _encode(value, row_id):
+    raw = json.dumps([value.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def _decode(cursor):
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(value), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
@@ -58,6 +58,21 @@ DATABASES = {
     'default': dj_database_url.config(default=os.getenv('DATABASE_URL'))
 }
 
+# Cache configuration: Redis is shared by all gunicorn workers, local memory is per process
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -142,6 +157,57 @@ AUTH_USER_MODEL = 'users.User'
 CLOUDBET_API_KEY = os.environ.get('CLOUDBET_API_KEY')
 CLOUDBET_API_BASE_URL = 'https://sports-api.cloudbet.com/pub/v2/'  # Include complete path
 
+# Odds cache (see groups/odds_cache.py): seconds each entry is fresh, per sport
+CLOUDBET_CACHE_TTLS = {
+    'default': 30,
+    'sports': 300,
+    'soccer': 60,
+}
+CLOUDBET_CACHE_STALE_TTL = 300  # How long stale odds may be served while refreshing
+CLOUDBET_CACHE_LOCK_TIMEOUT = 30  # Upper bound on a single upstream fetch, retries included
+ODDS_DELTA_RETENTION = 100  # Snapshot versions of removals kept for ?since= delta queries
+
+# Cloudbet HTTP transport (see groups/cloudbet.py)
+CLOUDBET_CONNECT_TIMEOUT = 3.05
+CLOUDBET_READ_TIMEOUT = 5
+CLOUDBET_MAX_RETRIES = 2
+CLOUDBET_POOL_SIZE = 10
+CLOUDBET_BREAKER_THRESHOLD = 5  # Consecutive failures before failing fast
+CLOUDBET_BREAKER_RESET_TIMEOUT = 30  # Seconds before a trial call is let through
+
+# Global leaderboard (see users/leaderboard.py)
+LEADERBOARD_SYNC_INTERVAL = 2  # Seconds between applying new ledger entries
+LEADERBOARD_RELOAD_INTERVAL = 600  # Seconds between full reloads
+LEADERBOARD_TAIL_LAG = 60  # Seconds ledger entries are re-read, for ones that commit out of id order
+
+# Friend suggestions (see users/suggestions.py)
+SUGGESTIONS_RELOAD_INTERVAL = 300  # Seconds between rebuilding the graph from the database
+
+# Unread notification badge counter (see users/unread_counts.py)
+UNREAD_COUNT_CACHE_TTL = 3600  # Bounds drift if an increment is ever lost
+UNREAD_COUNT_MARK_TTL = 60  # Seconds an increment marks a user, longer than any recount takes
+
+# Server-sent event streams (see roster_royals/broadcast.py and users/stream.py)
+BROADCAST_BACKEND = 'redis' if os.getenv('REDIS_URL') else 'local'  # Redis reaches every worker
+BROADCAST_REDIS_URL = os.getenv('REDIS_URL')
+BROADCAST_QUEUE_SIZE = 100  # Undelivered messages per connection before it is told to resync
+EVENT_STREAM_HEARTBEAT = 15  # Seconds between keepalive comments
+EVENT_STREAM_MAX_AGE = 300  # Streams end after this with a reauth event; the client reconnects with a new ticket
+EVENT_STREAM_TICKET_MAX_AGE = 60  # Seconds a stream ticket can be used to connect
+
+# Notification outbox (see users/outbox.py)
+OUTBOX_DISPATCH_INTERVAL = 1  # Seconds between polls when the outbox is empty
+OUTBOX_BATCH_SIZE = 500
+OUTBOX_RETENTION = 86400  # Seconds dispatched events are kept
+
+# Group detail cache (see groups/group_cache.py)
+GROUP_DETAIL_CACHE_TTL = 60  # Bounds how stale member points can get
+
+# Bet deadline sweeper (see groups/sweeper.py)
+BET_SWEEP_INTERVAL = 60  # Seconds between sweeps when looping
+BET_SWEEP_BATCH_SIZE = 1000
+BET_CLOSING_SOON_WINDOW = 3600  # Seconds before the deadline to notify members
+
 # Add to your existing settings
 SOCIAL_AUTH_GOOGLE_OAUTH2_KEY = os.environ.get('GOOGLE_OAUTH2_CLIENT_ID')
 SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET = os.environ.get('GOOGLE_OAUTH2_CLIENT_SECRET')
@@ -1,9 +1,22 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, Friendship, FriendRequest, Notification
+from .models import User, Friendship, FriendRequest, Notification, NotificationOutbox, PointsTransaction
 
 # Note: Django's built-in Group model (for permissions) is separate from our BettingGroup model
 admin.site.register(User, UserAdmin)
 admin.site.register(Friendship)
 admin.site.register(FriendRequest)
-admin.site.register(Notification) 
\ No newline at end of file
+admin.site.register(Notification)
+
+class PointsTransactionAdmin(admin.ModelAdmin):
+    list_display = ('user', 'amount', 'kind', 'reference_id', 'created_at')
+    list_filter = ('kind',)
+    search_fields = ('user__username',)
+
+admin.site.register(PointsTransaction, PointsTransactionAdmin)
+
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ('event_type', 'created_at', 'dispatched_at')
+    list_filter = ('event_type',)
+
+admin.site.register(NotificationOutbox, NotificationOutboxAdmin)
\ No newline at end of file
@@ -0,0 +1,161 @@
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max
+from .models import User, PointsTransaction
+
+logger = logging.getLogger(__name__)
+
+INSORT_LIMIT = 64  # Changed users above which the board is merged instead of moved one at a time
+
+class GlobalLeaderboard:
+    """Site-wide ranking by User.points kept in memory per process.
+
+    Users are held in a list sorted by (-points, id), so rank lookups are a
+    bisect and top-K / neighbours are slices. Every points change appends to
+    the ledger, so at most every LEADERBOARD_SYNC_INTERVAL seconds the
+    structure re-reads only the users with new ledger entries and moves them.
+    Entries are re-read for LEADERBOARD_TAIL_LAG seconds, so ones that
+    commit out of id order are still applied. A full reload every
+    LEADERBOARD_RELOAD_INTERVAL picks up anything that bypassed the ledger
+    or committed later still. Refreshes run in a background thread and
+    publish a new board, so requests never wait on them or read one
+    mid-update; only the first load blocks.
+    """
+
+    def __init__(self):
+        # (keys sorted by (-points, user_id), {user_id: points}); replaced, never mutated
+        self._board = ([], {})
+        self._last_transaction_id = 0
+        self._cursors = deque()  # (monotonic time, _last_transaction_id) history for the trailing window
+        self._seen = set()  # Ledger ids in the trailing window already applied
+        self._synced_at = None
+        self._loaded_at = None
+        self._refresh_lock = threading.Lock()
+
+    def top(self, k):
+        keys, _ = self._current()
+        return _rows(keys, 0, k)
+
+    def rank(self, user_id):
+        """1-based rank, or None for users not on the board"""
+        return _rank(*self._current(), user_id)
+
+    def around(self, user_id, window):
+        keys, points = self._current()
+        rank = _rank(keys, points, user_id)
+        if rank is None:
+            return None, []
+        start = max(rank - 1 - window, 0)
+        return rank, _rows(keys, start, rank + window)
+
+    def load(self):
+        with self._refresh_lock:
+            self._load()
+            self._synced_at = time.monotonic()
+
+    def _current(self):
+        """The board to read from, starting a refresh if it is due"""
+        if self._loaded_at is None:
+            # Nothing to rank yet, so the first request waits for the load
+            with self._refresh_lock:
+                if self._loaded_at is None:
+                    self._load()
+                    self._synced_at = time.monotonic()
+        elif not self._is_fresh() and self._refresh_lock.acquire(blocking=False):
+            # Requests keep reading the current board while one thread refreshes it
+            threading.Thread(target=self._refresh, daemon=True, name='leaderboard-refresh').start()
+        return self._board
+
+    def _refresh(self):
+        try:
+            if time.monotonic() - self._loaded_at >= settings.LEADERBOARD_RELOAD_INTERVAL:
+                self._load()
+            else:
+                self._apply_ledger_tail()
+            self._synced_at = time.monotonic()
+        except Exception:
+            logger.exception('Refreshing the global leaderboard failed')
+        finally:
+            connection.close()
+            self._refresh_lock.release()
+
+    def _is_fresh(self):
+        return self._synced_at is not None and time.monotonic() - self._synced_at < settings.LEADERBOARD_SYNC_INTERVAL
+
+    def _load(self):
+        # Read the ledger position first so changes racing the load are replayed
+        last = PointsTransaction.objects.aggregate(last=Max('id'))['last'] or 0
+        points = dict(_ranked_users().values_list('id', 'points'))
+        self._board = (sorted((-p, user_id) for user_id, p in points.items()), points)
+        self._last_transaction_id = last
+        self._loaded_at = time.monotonic()
+        self._cursors = deque([(self._loaded_at, last)])
+        self._seen = set()
+
+    def _apply_ledger_tail(self):
+        # Ids are assigned at insert, so a long transaction (a settlement batch)
+        # can commit ids below the cursor after it moved on. Re-read everything
+        # after where the cursor stood LEADERBOARD_TAIL_LAG seconds ago and apply
+        # the ids not seen before; anything later still is left to the full reload.
+        now = time.monotonic()
+        self._cursors.append((now, self._last_transaction_id))
+        while len(self._cursors) > 1 and now - self._cursors[1][0] >= settings.LEADERBOARD_TAIL_LAG:
+            self._cursors.popleft()
+        low = self._cursors[0][1]
+
+        changed, seen, last = set(), set(), self._last_transaction_id
+        for tx_id, user_id in PointsTransaction.objects.filter(id__gt=low).values_list('id', 'user_id'):
+            seen.add(tx_id)
+            if tx_id not in self._seen:
+                changed.add(user_id)
+            last = max(last, tx_id)
+        self._seen = seen
+        self._last_transaction_id = last
+        if not changed:
+            return
+
+        current = dict(_ranked_users().filter(id__in=changed).values_list('id', 'points'))
+        # Work on copies, so readers never see a half-updated board
+        keys, points = list(self._board[0]), dict(self._board[1])
+        if len(changed) > INSORT_LIMIT:
+            # Each move is a memmove of the whole list, so past a few users drop them
+            # all and merge them back in; sort() merges the two sorted runs in linear time
+            for user_id in changed:
+                points.pop(user_id, None)
+            points.update(current)
+            keys = [key for key in keys if key[1] not in changed]
+            keys.extend(sorted((-current[user_id], user_id) for user_id in current))
+            keys.sort()
+        else:
+            for user_id in changed:
+                old = points.pop(user_id, None)
+                if old is not None:
+                    del keys[bisect.bisect_left(keys, (-old, user_id))]
+                if user_id in current:
+                    points[user_id] = current[user_id]
+                    bisect.insort(keys, (-current[user_id], user_id))
+        self._board = (keys, points)
+
+def _rank(keys, points, user_id):
+    user_points = points.get(user_id)
+    if user_points is None:
+        return None
+    return bisect.bisect_left(keys, (-user_points, user_id)) + 1
+
+def _rows(keys, start, stop):
+    keys = keys[start:stop]
+    usernames = dict(User.objects.filter(id__in=[user_id for _, user_id in keys]).values_list('id', 'username'))
+    return [
+        {'rank': start + i + 1, 'user_id': user_id, 'username': usernames.get(user_id), 'points': -points}
+        for i, (points, user_id) in enumerate(keys)
+    ]
+
+def _ranked_users():
+    return User.objects.filter(is_active=True, is_staff=False, is_superuser=False)
+
+global_leaderboard = GlobalLeaderboard()
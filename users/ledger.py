@@ -0,0 +1,56 @@
+from django.db.models import F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from .models import User, PointsTransaction, PointsCheckpoint
+
+def record(user_id, amount, kind, reference_id=None):
+    """Append one ledger entry"""
+    return PointsTransaction.objects.create(
+        user_id=user_id, amount=amount, kind=kind, reference_id=reference_id
+    )
+
+def record_many(entries, batch_size=5000):
+    """Append (user_id, amount, kind, reference_id) entries with one bulk insert"""
+    return PointsTransaction.objects.bulk_create([
+        PointsTransaction(user_id=user_id, amount=amount, kind=kind, reference_id=reference_id)
+        for user_id, amount, kind, reference_id in entries
+    ], batch_size=batch_size)
+
+def balance(user_id):
+    """Ledger balance: the latest checkpoint plus the entries appended after it"""
+    checkpoint = PointsCheckpoint.objects.filter(user_id=user_id).order_by('-last_transaction_id').first()
+    tail = PointsTransaction.objects.filter(user_id=user_id)
+    if checkpoint:
+        tail = tail.filter(id__gt=checkpoint.last_transaction_id)
+    total = tail.aggregate(total=Sum('amount'))['total'] or 0
+    return (checkpoint.balance if checkpoint else 0) + total
+
+def with_ledger_balance(users):
+    """Annotate a User queryset with ledger_balance and last_transaction_id in one query"""
+    checkpoint = PointsCheckpoint.objects.filter(user=OuterRef('pk')).order_by('-last_transaction_id')
+    tail = PointsTransaction.objects.filter(user=OuterRef('pk'), id__gt=OuterRef('checkpoint_id'))
+    return users.annotate(
+        checkpoint_balance=Coalesce(Subquery(checkpoint.values('balance')[:1]), Value(0)),
+        checkpoint_id=Coalesce(Subquery(checkpoint.values('last_transaction_id')[:1]), Value(0)),
+    ).annotate(
+        tail_total=Coalesce(Subquery(
+            tail.values('user').annotate(total=Sum('amount')).values('total')
+        ), Value(0)),
+        last_transaction_id=Subquery(
+            tail.values('user').annotate(last=Max('id')).values('last')
+        ),
+    ).annotate(ledger_balance=F('checkpoint_balance') + F('tail_total'))
+
+def checkpoint(batch_size=5000):
+    """Write a checkpoint for every user with entries since their last one"""
+    rows = with_ledger_balance(User.objects.all()).filter(
+        last_transaction_id__isnull=False
+    ).values_list('id', 'ledger_balance', 'last_transaction_id')
+    checkpoints = PointsCheckpoint.objects.bulk_create([
+        PointsCheckpoint(user_id=user_id, balance=ledger_balance, last_transaction_id=last_transaction_id)
+        for user_id, ledger_balance, last_transaction_id in rows.iterator()
+    ], batch_size=batch_size)
+    return len(checkpoints)
+
+def mismatches():
+    """Users whose User.points disagrees with their ledger balance"""
+    return with_ledger_balance(User.objects.all()).exclude(points=F('ledger_balance'))
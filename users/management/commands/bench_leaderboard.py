@@ -0,0 +1,53 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from users.leaderboard import GlobalLeaderboard, _ranked_users
+from users.models import User
+
+class Command(BaseCommand):
+    help = 'Compare in-memory leaderboard rank lookups with COUNT(*) queries (synthetic users, rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--lookups', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            User.objects.bulk_create([
+                User(username=f'bench-rank-{i}', points=random.randint(0, 100000))
+                for i in range(options['users'])
+            ], batch_size=5000)
+            sample = list(_ranked_users().filter(username__startswith='bench-rank-').values_list('id', 'points'))
+            sample = random.sample(sample, min(options['lookups'], len(sample)))
+
+            board = GlobalLeaderboard()
+            started = time.monotonic()
+            board.load()
+            load_time = time.monotonic() - started
+
+            started = time.perf_counter()
+            naive = [
+                _ranked_users().filter(points__gt=points).count() + 1
+                for _, points in sample
+            ]
+            naive_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            fast = [board.rank(user_id) for user_id, _ in sample]
+            fast_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for _ in sample:
+                board._board[0][:10]
+            top_time = time.perf_counter() - started
+            transaction.set_rollback(True)
+
+        # The board breaks ties by id, the naive query gives tied users the same rank
+        mismatched = sum(1 for a, b in zip(naive, fast) if b < a)
+        n = len(sample)
+        self.stdout.write(f'Loaded {len(board._board[0])} users in {load_time:.2f}s')
+        self.stdout.write(f'COUNT(*) rank: {naive_time / n * 1e6:.1f} us/lookup')
+        self.stdout.write(f'In-memory rank: {fast_time / n * 1e6:.1f} us/lookup '
+                          f'({naive_time / fast_time:.0f}x faster), {mismatched} inconsistent')
+        self.stdout.write(f'In-memory top-10 slice: {top_time / n * 1e6:.2f} us')
@@ -0,0 +1,64 @@
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+from users.suggestions import SuggestionGraph
+
+class Command(BaseCommand):
+    help = 'Time friend suggestions on a synthetic social graph (no database access)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200000)
+        parser.add_argument('--edges', type=int, default=1000000, help='Undirected friendships')
+        parser.add_argument('--groups', type=int, default=20000)
+        parser.add_argument('--memberships', type=int, default=300000)
+        parser.add_argument('--lookups', type=int, default=200)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        users = options['users']
+        # Skewed degrees so some users have thousands of second-degree connections
+        weights = 1 / np.arange(1, users + 1) ** 0.8
+        weights /= weights.sum()
+        a = rng.choice(users, options['edges'], p=weights)
+        b = rng.integers(0, users, options['edges'])
+        a, b = a[a != b], b[a != b]
+        pairs = np.unique(np.stack([np.minimum(a, b), np.maximum(a, b)], axis=1), axis=0)
+        friendships = np.concatenate([pairs, pairs[:, ::-1]])
+        memberships = np.unique(np.stack([
+            rng.integers(0, users, options['memberships']),
+            rng.choice(options['groups'], options['memberships'], p=_zipf(options['groups']))
+        ], axis=1), axis=0)
+
+        graph = SuggestionGraph()
+        started = time.perf_counter()
+        graph.load_edges(friendships, memberships)
+        build_time = time.perf_counter() - started
+
+        degree = np.bincount(friendships[:, 0], minlength=users)
+        sample = np.argsort(-degree)[:options['lookups']]
+        timings, reach = [], []
+        for user_id in sample.tolist():
+            started = time.perf_counter()
+            graph.suggest(user_id, 10)
+            timings.append(time.perf_counter() - started)
+            friends = friendships[friendships[:, 0] == user_id, 1]
+            reach.append(int(degree[friends].sum()))
+
+        for user_id in sample[:50].tolist():
+            graph.add_friendship(user_id, int(rng.integers(0, users)))
+        started = time.perf_counter()
+        for user_id in sample.tolist():
+            graph.suggest(user_id, 10)
+        delta_time = (time.perf_counter() - started) / len(sample)
+
+        timings = np.array(timings) * 1000
+        self.stdout.write(f'Built {len(pairs)} friendships and {len(memberships)} memberships '
+                          f'({users} users) in {build_time:.2f}s')
+        self.stdout.write(f'Highest-degree users: median {int(np.median(reach))} second-degree connections '
+                          f'(max {max(reach)})')
+        self.stdout.write(f'Suggest: p50 {np.percentile(timings, 50):.2f}ms, p99 {np.percentile(timings, 99):.2f}ms')
+        self.stdout.write(f'Suggest with pending deltas: {delta_time * 1000:.2f}ms avg')
+
+def _zipf(n):
+    weights = 1 / np.arange(1, n + 1)
+    return weights / weights.sum()
@@ -0,0 +1,76 @@
+import random
+import string
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from users.models import User, Friendship, FriendRequest
+from users.views import search_users
+
+class Command(BaseCommand):
+    help = 'Compare per-result status lookups with the prefix-first user search (synthetic users, rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000000)
+        parser.add_argument('--searches', type=int, default=200)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        with transaction.atomic():
+            started = time.monotonic()
+            for start in range(0, options['users'], 50000):
+                User.objects.bulk_create([
+                    User(username=f'{self._name(rng)}{i}')
+                    for i in range(start, min(start + 50000, options['users']))
+                ], batch_size=5000)
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE users_user')
+            self.stdout.write(f'Created {options["users"]} users in {time.monotonic() - started:.1f}s')
+
+            viewer = User.objects.create(username='bench-search-viewer')
+            others = list(User.objects.exclude(id=viewer.id).order_by('?').values_list('id', flat=True)[:2000])
+            Friendship.objects.bulk_create([Friendship(user=viewer, friend_id=i) for i in others[:1000]])
+            FriendRequest.objects.bulk_create([FriendRequest(from_user=viewer, to_user_id=i) for i in others[1000:]])
+
+            terms = [self._name(rng)[:rng.randint(2, 4)] for _ in range(options['searches'])]
+            naive = self._run(terms, lambda term: self._naive_search(viewer, term))
+            fast = self._run(terms, lambda term: self._view_search(viewer, term))
+            transaction.set_rollback(True)
+
+        for label, (elapsed, queries) in (('Per-result lookups', naive), ('Prefix-first search', fast)):
+            self.stdout.write(f'{label}: {elapsed / len(terms) * 1000:.2f} ms/search, '
+                              f'{queries / len(terms):.1f} queries/search')
+
+    def _run(self, terms, search):
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            for term in terms:
+                search(term)
+            return time.perf_counter() - started, queries
+
+    def _view_search(self, viewer, term):
+        request = APIRequestFactory().get('/api/users/search/', {'q': term})
+        force_authenticate(request, user=viewer)
+        return search_users(request).data
+
+    def _naive_search(self, viewer, term):
+        """The search as it was before, kept here for comparison"""
+        users = User.objects.filter(username__icontains=term).exclude(id=viewer.id)\
+            .exclude(is_staff=True).exclude(is_superuser=True)
+        results = []
+        for user in users[:10]:
+            is_friend = viewer.friends.filter(id=user.id).exists()
+            pending = FriendRequest.objects.filter(from_user=viewer, to_user=user, status='pending').exists()
+            results.append((user.id, 'friends' if is_friend else 'pending' if pending else 'none'))
+        return results
+
+    def _name(self, rng):
+        return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
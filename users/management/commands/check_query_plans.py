@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from groups.models import Bet, GroupActivity
+from users.models import Notification
+
+def _index_name(model, fields):
+    return next(index.name for index in model._meta.indexes if index.fields == fields)
+
+class Command(BaseCommand):
+    help = 'EXPLAIN hot lookups and check that each one uses its composite index'
+
+    def checks(self):
+        now = timezone.now()
+        return [
+            ('invite notification cleanup',
+             # As run by .delete(), which drops Meta.ordering
+             Notification.objects.filter(user_id=1, notification_type='group_invite', reference_id=1).order_by(),
+             _index_name(Notification, ['user', 'notification_type', 'reference_id'])),
+            ('notification listing',
+             Notification.objects.filter(user_id=1).order_by('-created_at')[:20],
+             _index_name(Notification, ['user', '-created_at'])),
+            ('group activity page',
+             GroupActivity.objects.filter(group_id=1, created_at__lte=now).order_by('-created_at', '-id')[:20],
+             _index_name(GroupActivity, ['group', '-created_at', '-id'])),
+            ('bet deadline sweep',
+             Bet.objects.filter(status='open', deadline__lte=now).order_by('deadline', 'id')[:1000],
+             _index_name(Bet, ['status', 'deadline'])),
+        ]
+
+    def handle(self, *args, **options):
+        failed = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Small or empty tables would otherwise get a seq scan, whatever the indexes
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            for label, queryset, index in self.checks():
+                plan = queryset.explain()
+                used = index in plan
+                self.stdout.write(f'{"ok" if used else "MISSING"}  {label}: {index}')
+                if options['verbosity'] > 1 or not used:
+                    self.stdout.write(f'    {plan}')
+                if not used:
+                    failed.append(label)
+        if failed:
+            raise CommandError(f'Index not used for: {", ".join(failed)}')
@@ -0,0 +1,19 @@
+import time
+from django.core.management.base import BaseCommand
+from users import ledger
+
+class Command(BaseCommand):
+    help = 'Write points balance checkpoints so ledger reads only sum a short tail'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Keep running and checkpoint every N seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            count = ledger.checkpoint()
+            self.stdout.write(f'Wrote {count} checkpoints in {time.monotonic() - started:.2f}s')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,27 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from users import outbox
+
+class Command(BaseCommand):
+    help = 'Expand queued notification events into notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running, polling every OUTBOX_DISPATCH_INTERVAL seconds when idle')
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        last_purge = 0
+        while True:
+            events, notifications = outbox.dispatch(options['batch_size'])
+            if events:
+                self.stdout.write(f'Dispatched {events} events as {notifications} notifications')
+            if time.monotonic() - last_purge >= 3600:
+                outbox.purge()
+                last_purge = time.monotonic()
+
+            if events < options['batch_size']:  # Drained
+                if not options['loop']:
+                    break
+                time.sleep(settings.OUTBOX_DISPATCH_INTERVAL)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from users import ledger
+from users.models import User
+
+class Command(BaseCommand):
+    help = 'Compare User.points with the points ledger for every user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true',
+                            help='Append adjustment entries so the ledger matches User.points')
+        parser.add_argument('--show', type=int, default=20, help='Number of mismatches to list')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rows = list(ledger.mismatches().values_list('id', 'username', 'points', 'ledger_balance'))
+            for user_id, username, points, ledger_balance in rows[:options['show']]:
+                self.stdout.write(f'{username} (#{user_id}): points={points} ledger={ledger_balance}')
+
+            if rows and options['fix']:
+                # Lock the users, then recompute: a wager or payout that was mid-transaction
+                # when the rows were read has committed by now and is not drift
+                user_ids = [row[0] for row in rows]
+                list(User.objects.select_for_update().filter(id__in=user_ids).order_by('id').values_list('id'))
+                drift = ledger.mismatches().filter(id__in=user_ids).values_list('id', 'points', 'ledger_balance')
+                entries = ledger.record_many(
+                    (user_id, points - ledger_balance, 'adjustment', None)
+                    for user_id, points, ledger_balance in drift
+                )
+                self.stdout.write(f'Appended {len(entries)} adjustment entries')
+
+        self.stdout.write(f'{len(rows)} mismatched users')
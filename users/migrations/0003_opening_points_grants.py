@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def grant_opening_balances(apps, schema_editor):
+    """Give every existing user a ledger entry matching their current points"""
+    User = apps.get_model('users', 'User')
+    PointsTransaction = apps.get_model('users', 'PointsTransaction')
+    PointsTransaction.objects.bulk_create([
+        PointsTransaction(user_id=user_id, amount=points, kind='grant')
+        for user_id, points in User.objects.exclude(points=0).values_list('id', 'points').iterator()
+    ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_points_ledger'),
+    ]
+
+    operations = [
+        migrations.RunPython(grant_opening_balances, migrations.RunPython.noop),
+    ]
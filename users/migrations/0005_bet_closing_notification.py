@@ -0,0 +1,18 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_points_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('friend_request', 'Friend Request'), ('friend_accepted', 'Friend Request Accepted'), ('group_invite', 'Group Invitation'), ('bet_closing', 'Bet Closing Soon'), ('info', 'Information')], max_length=50),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_bet_closing_notification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'notification_type', 'reference_id'], name='users_notif_user_id_479c36_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at'], name='users_notif_user_id_c37f16_idx'),
+        ),
+    ]
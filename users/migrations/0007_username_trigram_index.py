@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# icontains/istartswith compile to UPPER(username) LIKE UPPER(...) on
+# Postgres, so the trigram index is built on the same expression.
+CREATE_INDEX = (
+    'CREATE INDEX IF NOT EXISTS users_user_username_trgm_idx '
+    'ON users_user USING gin (UPPER(username) gin_trgm_ops)'
+)
+DROP_INDEX = 'DROP INDEX IF EXISTS users_user_username_trgm_idx'
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(CREATE_INDEX)
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_notification_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.19 on 2026-10-18 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_username_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('group_invites', 'Group Invites'), ('group_joined', 'Group Joined'), ('friend_accepted', 'Friend Request Accepted')], max_length=30)),
+                ('payload', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('dispatched_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dispatched_at', 'id'], name='users_notif_dispatc_6e74d8_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# istartswith compiles to UPPER(username) LIKE UPPER('q%') on Postgres;
+# text_pattern_ops lets that LIKE use the index as a range scan whatever
+# the database collation. The trigram index can't serve 2-character
+# queries, so prefix matches need their own index.
+CREATE_INDEX = (
+    'CREATE INDEX IF NOT EXISTS users_user_username_prefix_idx '
+    'ON users_user (UPPER(username) text_pattern_ops)'
+)
+DROP_INDEX = 'DROP INDEX IF EXISTS users_user_username_prefix_idx'
+
+
+def create_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_INDEX)
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
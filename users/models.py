@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.core.exceptions import ValidationError
+from roster_royals.broadcast import broadcaster, user_channel
+from . import unread_counts
 
 class User(AbstractUser):
     """Extended user model"""
@@ -12,6 +14,16 @@ class User(AbstractUser):
         through='Friendship'
     )
 
+    class Meta(AbstractUser.Meta):
+        indexes = [models.Index(fields=['-points', 'id'])]
+
+    def save(self, *args, **kwargs):
+        creating = self._state.adding
+        super().save(*args, **kwargs)
+        if creating and self.points:
+            # Opening balance goes through the ledger like every other change
+            PointsTransaction.objects.create(user=self, amount=self.points, kind='grant')
+
 class Friendship(models.Model):
     """Model to handle friendships and prevent self-friendship"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='friendships')
@@ -39,6 +51,13 @@ class FriendRequest(models.Model):
     class Meta:
         unique_together = ('from_user', 'to_user')
 
+class NotificationQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        unread_counts.added(n.user_id for n in objs if not n.is_read)
+        broadcaster.publish_many((user_channel(n.user_id), n.as_event()) for n in objs)
+        return objs
+
 class Notification(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
     message = models.CharField(max_length=255)
@@ -46,6 +65,7 @@ class Notification(models.Model):
         ('friend_request', 'Friend Request'),
         ('friend_accepted', 'Friend Request Accepted'),
         ('group_invite', 'Group Invitation'),
+        ('bet_closing', 'Bet Closing Soon'),
         ('info', 'Information'),
     ])
     created_at = models.DateTimeField(auto_now_add=True)
@@ -53,11 +73,75 @@ class Notification(models.Model):
     requires_action = models.BooleanField(default=False)
     reference_id = models.IntegerField(null=True, blank=True)
 
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'notification_type', 'reference_id']),  # Invite cleanup
+            models.Index(fields=['user', '-created_at']),  # Notification listing
+        ]
 
     def save(self, *args, **kwargs):
         # Automatically set requires_action based on notification type
-        if not self.id:  # Only on creation
+        creating = not self.id
+        if creating:  # Only on creation
             self.requires_action = self.notification_type in ['friend_request', 'group_invite']
-        super().save(*args, **kwargs) 
\ No newline at end of file
+        super().save(*args, **kwargs)
+        if creating:
+            if not self.is_read:
+                unread_counts.added([self.user_id])
+            broadcaster.publish(user_channel(self.user_id), self.as_event())
+
+    def as_event(self):
+        """Payload pushed to the user's event stream"""
+        return {
+            'type': 'notification',
+            'id': self.id,
+            'message': self.message,
+            'notification_type': self.notification_type,
+            'created_at': self.created_at,
+            'requires_action': self.requires_action,
+            'reference_id': self.reference_id,
+        }
+
+class PointsTransaction(models.Model):
+    """Append-only ledger entry for a change to a user's points"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='points_transactions')
+    amount = models.IntegerField()  # Signed: negative for wagers
+    kind = models.CharField(max_length=20, choices=[
+        ('wager', 'Wager'),
+        ('payout', 'Payout'),
+        ('refund', 'Refund'),
+        ('grant', 'Grant'),
+        ('adjustment', 'Adjustment'),
+    ])
+    reference_id = models.IntegerField(null=True, blank=True)  # e.g. the UserBet id
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'id'])]
+
+class PointsCheckpoint(models.Model):
+    """User's ledger balance as of a given transaction id"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='points_checkpoints')
+    balance = models.IntegerField()
+    last_transaction_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', '-last_transaction_id'])]
+
+class NotificationOutbox(models.Model):
+    """Event recorded in a request's transaction, expanded into notifications later"""
+    event_type = models.CharField(max_length=30, choices=[
+        ('group_invites', 'Group Invites'),
+        ('group_joined', 'Group Joined'),
+        ('friend_accepted', 'Friend Request Accepted'),
+    ])
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['dispatched_at', 'id'])]
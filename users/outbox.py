@@ -0,0 +1,91 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from groups.models import BettingGroup, GroupInvite
+from .models import Notification, NotificationOutbox, User
+
+def record(event_type, **payload):
+    """Queue a notification event; call inside the transaction making the change"""
+    NotificationOutbox.objects.create(event_type=event_type, payload=payload)
+
+def dispatch(batch_size=None):
+    """Expand one batch of pending events into notifications.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+    dispatchers can run side by side without sending anything twice. The
+    notifications for the whole batch go in with one bulk insert, in the
+    same transaction that marks the events dispatched. Returns
+    (events, notifications).
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    with transaction.atomic():
+        events = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True)
+            .filter(dispatched_at__isnull=True).order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0, 0
+
+        by_type = {}
+        for event in events:
+            by_type.setdefault(event.event_type, []).append(event.payload)
+        notifications = []
+        for event_type, payloads in by_type.items():
+            notifications.extend(EXPANDERS[event_type](payloads))
+        Notification.objects.bulk_create(notifications, batch_size=1000)
+        NotificationOutbox.objects.filter(id__in=[event.id for event in events]).update(dispatched_at=timezone.now())
+    return len(events), len(notifications)
+
+def purge():
+    """Delete dispatched events older than OUTBOX_RETENTION seconds"""
+    cutoff = timezone.now() - timedelta(seconds=settings.OUTBOX_RETENTION)
+    return NotificationOutbox.objects.filter(dispatched_at__lt=cutoff).delete()[0]
+
+def _group_invites(payloads):
+    invite_ids = [invite_id for payload in payloads for invite_id in payload['invite_ids']]
+    invites = GroupInvite.objects.filter(id__in=invite_ids, status='pending').select_related('group')
+    inviters = _usernames(payload['from_user_id'] for payload in payloads)
+    invited_by = {invite_id: payload['from_user_id'] for payload in payloads for invite_id in payload['invite_ids']}
+    return [
+        Notification(
+            user_id=invite.to_user_id,
+            message=f"{inviters.get(invited_by[invite.id])} invited you to join {invite.group.name}",
+            notification_type='group_invite',
+            requires_action=True,  # bulk_create skips Notification.save()
+            reference_id=invite.id
+        )
+        for invite in invites
+    ]
+
+def _group_joined(payloads):
+    groups = BettingGroup.objects.in_bulk({payload['group_id'] for payload in payloads})
+    members = _usernames(payload['user_id'] for payload in payloads)
+    return [
+        Notification(
+            user_id=groups[payload['group_id']].president_id,
+            message=f"{members.get(payload['user_id'])} joined {groups[payload['group_id']].name}",
+            notification_type='info'
+        )
+        for payload in payloads if payload['group_id'] in groups
+    ]
+
+def _friend_accepted(payloads):
+    accepters = _usernames(payload['user_id'] for payload in payloads)
+    return [
+        Notification(
+            user_id=payload['to_user_id'],
+            message=f"{accepters.get(payload['user_id'])} accepted your friend request",
+            notification_type='friend_accepted'
+        )
+        for payload in payloads
+    ]
+
+def _usernames(user_ids):
+    return dict(User.objects.filter(id__in=set(user_ids)).values_list('id', 'username'))
+
+EXPANDERS = {
+    'group_invites': _group_invites,
+    'group_joined': _group_joined,
+    'friend_accepted': _friend_accepted,
+}
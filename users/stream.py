@@ -0,0 +1,75 @@
+import asyncio
+import json
+import time
+from django.conf import settings
+from django.core import signing
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from groups.cloudbet import CloudbetClient
+from roster_royals.broadcast import broadcaster, odds_channel, user_channel
+from .models import User
+
+TICKET_SALT = 'users.stream.ticket'  # Tickets are only good for opening a stream
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def stream_ticket(request):
+    """Short-lived ticket for ?ticket= on the event stream, so the auth token stays out of URLs"""
+    return Response({
+        'ticket': signing.dumps(request.user.id, salt=TICKET_SALT),
+        'expires_in': settings.EVENT_STREAM_TICKET_MAX_AGE
+    })
+
+async def event_stream(request):
+    """Server-sent events for the signed-in user, plus odds changes for ?sports=.
+
+    EventSource can't send headers, so the client passes a ticket from
+    stream_ticket as ?ticket= rather than its auth token, which would end up
+    in access logs. Tickets expire after EVENT_STREAM_TICKET_MAX_AGE, so a
+    stream ends with `event: reauth`: the client closes its EventSource and
+    opens a new one with a fresh ticket instead of letting the browser
+    retry with the old one. Needs the ASGI server: each open stream is a
+    coroutine waiting on its queue rather than a worker thread.
+    """
+    if request.method != 'GET':  # require_GET can't wrap async views before Django 5
+        return HttpResponseNotAllowed(['GET'])
+    try:
+        user_id = signing.loads(request.GET.get('ticket', ''), salt=TICKET_SALT,
+                                max_age=settings.EVENT_STREAM_TICKET_MAX_AGE)
+    except signing.BadSignature:  # Also raised for expired tickets
+        return JsonResponse({'error': 'Invalid or expired ticket'}, status=401)
+    if not await User.objects.filter(id=user_id, is_active=True).aexists():
+        return JsonResponse({'error': 'Invalid or expired ticket'}, status=401)
+
+    sports = [s for s in request.GET.get('sports', '').split(',') if s]
+    unknown = [s for s in sports if s not in CloudbetClient.SUPPORTED_SPORTS]
+    if unknown:
+        return JsonResponse({'error': f'Unknown sports: {", ".join(unknown)}'}, status=400)
+
+    channels = [user_channel(user_id)] + [odds_channel(sport) for sport in sports]
+    response = StreamingHttpResponse(_events(channels), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+async def _events(channels):
+    subscription = broadcaster.subscribe(channels)
+    deadline = time.monotonic() + settings.EVENT_STREAM_MAX_AGE
+    try:
+        while time.monotonic() < deadline:
+            try:
+                message = await asyncio.wait_for(subscription.get(), settings.EVENT_STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            if subscription.overflowed:
+                # Messages were dropped; the client should refetch over REST
+                yield 'event: resync\ndata: {}\n\n'
+                break
+            yield f'event: {message["type"]}\ndata: {json.dumps(message, default=str)}\n\n'
+        # The ticket this stream opened with has expired, so a browser retry would get a 401
+        yield 'event: reauth\ndata: {}\n\n'
+    finally:
+        broadcaster.unsubscribe(subscription)
@@ -0,0 +1,217 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from groups.models import BettingGroup
+from .models import Friendship
+
+FRIEND_WEIGHT = 1.0  # Per mutual friend
+GROUP_WEIGHT = 0.5  # Per shared betting group
+REBUILD_THRESHOLD = 10000  # Pending edge changes before the arrays are rebuilt
+
+EMPTY = np.array([], dtype=np.int64)
+
+logger = logging.getLogger(__name__)
+
+class SuggestionGraph:
+    """Friend suggestions ("people you may know") from an in-memory graph.
+
+    Friendships and group memberships are held as CSR arrays: sorted row
+    keys, row offsets and a flat column array, so a user's neighbours are a
+    binary search plus a slice and a whole friend list's neighbours are one
+    vectorized gather. Candidates are friends of friends and co-members of
+    the user's groups, scored with NumPy.
+
+    Changes made in this process are applied as small per-user deltas on
+    top of the arrays. Every SUGGESTIONS_RELOAD_INTERVAL seconds, or once
+    REBUILD_THRESHOLD deltas pile up, a background thread rebuilds the
+    arrays from the database, which also picks up changes made by other
+    processes. Requests keep using the old arrays until the new ones are
+    swapped in; only the very first load blocks.
+    """
+
+    def __init__(self):
+        self._friends = _csr(EMPTY, EMPTY)
+        self._user_groups = _csr(EMPTY, EMPTY)
+        self._group_members = _csr(EMPTY, EMPTY)
+        self._added_friends = defaultdict(set)
+        self._removed_friends = defaultdict(set)
+        self._added_groups = defaultdict(set)
+        self._added_members = defaultdict(set)
+        self._pending = 0
+        self._replay = None  # Changes made while a reload is reading the database
+        self._loaded_at = None
+        self._lock = threading.Lock()  # Guards the arrays and deltas; never held for a database read
+        self._reload_lock = threading.Lock()
+
+    def suggest(self, user_id, limit=10, exclude=()):
+        """Top `limit` (user_id, score, mutual_friends, shared_groups) for user_id"""
+        self._sync()
+        with self._lock:
+            friends = self._neighbours(self._friends, self._added_friends, self._removed_friends, [user_id])
+            friends_of_friends = self._neighbours(self._friends, self._added_friends, self._removed_friends, friends)
+            groups = self._neighbours(self._user_groups, self._added_groups, {}, [user_id])
+            co_members = self._neighbours(self._group_members, self._added_members, {}, groups)
+
+        candidates = np.concatenate([friends_of_friends, co_members])
+        if not len(candidates):
+            return []
+        ids, inverse = np.unique(candidates, return_inverse=True)
+        split = len(friends_of_friends)
+        mutual = np.bincount(inverse[:split], minlength=len(ids))
+        shared = np.bincount(inverse[split:], minlength=len(ids))
+        score = mutual * FRIEND_WEIGHT + shared * GROUP_WEIGHT
+
+        keep = ~np.isin(ids, np.concatenate([friends, np.array([user_id, *exclude], dtype=np.int64)]))
+        ids, score, mutual, shared = ids[keep], score[keep], mutual[keep], shared[keep]
+        if len(ids) > limit:
+            top = np.argpartition(-score, limit - 1)[:limit]
+            ids, score, mutual, shared = ids[top], score[top], mutual[top], shared[top]
+        order = np.lexsort((ids, -score))
+        return [
+            (int(ids[i]), float(score[i]), int(mutual[i]), int(shared[i]))
+            for i in order
+        ]
+
+    def add_friendship(self, user_id, friend_id):
+        self._change(self._add_friendship, user_id, friend_id)
+
+    def remove_friendship(self, user_id, friend_id):
+        self._change(self._remove_friendship, user_id, friend_id)
+
+    def add_member(self, group_id, user_id):
+        self._change(self._add_member, group_id, user_id)
+
+    def load(self):
+        with self._reload_lock:
+            self._reload()
+
+    def load_edges(self, friendships, memberships):
+        """Replace the graph with (user_id, friend_id) and (user_id, group_id) pairs"""
+        arrays = _build(friendships, memberships)
+        with self._lock:
+            self._swap(arrays)
+
+    def _sync(self):
+        with self._lock:
+            loaded = self._loaded_at is not None
+            due = (not loaded or self._pending >= REBUILD_THRESHOLD
+                   or time.monotonic() - self._loaded_at >= settings.SUGGESTIONS_RELOAD_INTERVAL)
+        if not due:
+            return
+        if not loaded:
+            # Nothing to suggest from yet, so the first request waits for the load
+            with self._reload_lock:
+                if self._loaded_at is None:
+                    self._reload()
+        elif self._reload_lock.acquire(blocking=False):
+            # Requests keep using the current arrays while one thread rebuilds them
+            threading.Thread(target=self._reload_in_background, daemon=True, name='suggestions-reload').start()
+
+    def _reload_in_background(self):
+        try:
+            self._reload()
+        except Exception:
+            logger.exception('Reloading the suggestion graph failed')
+        finally:
+            connection.close()
+            self._reload_lock.release()
+
+    def _reload(self):
+        """Rebuild the arrays from the database without holding the lock, then swap them in"""
+        with self._lock:
+            self._replay = []
+        try:
+            arrays = _build(
+                list(Friendship.objects.values_list('user_id', 'friend_id').iterator(chunk_size=10000)),
+                list(BettingGroup.members.through.objects.values_list('user_id', 'bettinggroup_id')
+                     .iterator(chunk_size=10000))
+            )
+        except BaseException:
+            with self._lock:
+                self._replay = None
+            raise
+        with self._lock:
+            replay, self._replay = self._replay, None
+            self._swap(arrays)
+            # Changes made during the read may be missing from it; they are idempotent, so re-apply them
+            for apply, *args in replay:
+                apply(*args)
+                self._pending += 1
+
+    def _swap(self, arrays):
+        self._friends, self._user_groups, self._group_members = arrays
+        for deltas in (self._added_friends, self._removed_friends, self._added_groups, self._added_members):
+            deltas.clear()
+        self._pending = 0
+        self._loaded_at = time.monotonic()
+
+    def _change(self, apply, *args):
+        with self._lock:
+            apply(*args)
+            self._pending += 1
+            if self._replay is not None:
+                self._replay.append((apply, *args))
+
+    def _add_friendship(self, user_id, friend_id):
+        for a, b in ((user_id, friend_id), (friend_id, user_id)):
+            self._removed_friends.get(a, set()).discard(b)
+            self._added_friends[a].add(b)
+
+    def _remove_friendship(self, user_id, friend_id):
+        for a, b in ((user_id, friend_id), (friend_id, user_id)):
+            self._added_friends.get(a, set()).discard(b)
+            self._removed_friends[a].add(b)
+
+    def _add_member(self, group_id, user_id):
+        self._added_groups[user_id].add(group_id)
+        self._added_members[group_id].add(user_id)
+
+    def _neighbours(self, csr, added, removed, keys):
+        """Concatenated neighbours of every key, with this process's deltas applied"""
+        keys = np.asarray(keys, dtype=np.int64)
+        dirty = [key for key in keys.tolist() if key in added or key in removed]
+        if not dirty:
+            return _gather(csr, keys)
+        parts = [_gather(csr, keys[~np.isin(keys, dirty)])]
+        for key in dirty:
+            row = (set(_gather(csr, np.array([key])).tolist()) | added.get(key, set())) - removed.get(key, set())
+            parts.append(np.fromiter(row, dtype=np.int64, count=len(row)))
+        return np.concatenate(parts)
+
+def _build(friendships, memberships):
+    """Friend, user-to-group and group-to-member CSR arrays from edge pairs"""
+    friendships = np.array(friendships, dtype=np.int64).reshape(-1, 2)
+    memberships = np.array(memberships, dtype=np.int64).reshape(-1, 2)
+    return (
+        _csr(friendships[:, 0], friendships[:, 1]),
+        _csr(memberships[:, 0], memberships[:, 1]),
+        _csr(memberships[:, 1], memberships[:, 0]),
+    )
+
+def _csr(rows, cols):
+    """(row keys, offsets, columns) with each row's columns contiguous"""
+    order = np.lexsort((cols, rows))
+    rows, cols = rows[order], cols[order]
+    keys, starts = np.unique(rows, return_index=True)
+    return keys, np.append(starts, len(rows)), cols
+
+def _gather(csr, wanted):
+    keys, offsets, cols = csr
+    if not len(keys) or not len(wanted):
+        return EMPTY
+    index = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    index = index[keys[index] == wanted]
+    starts = offsets[index]
+    lengths = offsets[index + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return EMPTY
+    # Position of every column: its row's start plus its place within the row
+    positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+    return cols[positions]
+
+friend_suggestions = SuggestionGraph()
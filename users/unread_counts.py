@@ -0,0 +1,52 @@
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+def get(user_id):
+    """Cached unread notification count, or None if it has to be recounted and passed to fill()"""
+    count = cache.get(_key(user_id))
+    if count is None:
+        # Increments from here on mark the user, so fill() can tell its count may be stale
+        cache.delete(_mark_key(user_id))
+    return count
+
+def fill(user_id, count):
+    """Cache a freshly counted value unless an increment got there first.
+
+    A notification committed after the count was taken but before the value
+    is cached finds nothing to increment. Increments mark the user first,
+    so when the mark is there the value is dropped again and the next read
+    recounts.
+    """
+    cache.add(_key(user_id), count, settings.UNREAD_COUNT_CACHE_TTL)
+    if cache.get(_mark_key(user_id)) is not None:
+        cache.delete(_key(user_id))
+
+def reset(user_id):
+    cache.set(_key(user_id), 0, settings.UNREAD_COUNT_CACHE_TTL)
+
+def forget(user_id):
+    """Drop the counter when notifications are deleted; the next read recounts"""
+    transaction.on_commit(lambda: cache.delete(_key(user_id)))
+
+def added(user_ids):
+    """Count new unread notifications once the transaction inserting them commits"""
+    counts = Counter(user_ids)
+    if counts:
+        transaction.on_commit(lambda: _increment(counts))
+
+def _increment(counts):
+    # Mark before incrementing: a racing fill() either sees the mark or is cached in time to be incremented
+    cache.set_many({_mark_key(user_id): 1 for user_id in counts}, settings.UNREAD_COUNT_MARK_TTL)
+    for user_id, count in counts.items():
+        try:
+            cache.incr(_key(user_id), count)
+        except ValueError:
+            pass  # Not cached, the next read counts from the table
+
+def _key(user_id):
+    return f'notifications:unread:{user_id}'
+
+def _mark_key(user_id):
+    return f'notifications:unread:{user_id}:incremented'
@@ -1,16 +1,22 @@
 from django.urls import path
-from . import views
+from . import stream, views
 
 urlpatterns = [
     path('register/', views.RegisterView.as_view()),
     path('login/', views.login_view),
     path('friends/', views.get_friends),
     path('users/search/', views.search_users, name='search-users'),
+    path('users/suggestions/', views.get_friend_suggestions, name='friend-suggestions'),
     path('friend-requests/', views.get_friend_requests),
     path('friend-request/<int:request_id>/handle/', views.handle_friend_request),
     path('friend-request/send/<int:user_id>/', views.send_friend_request),
     path('notifications/', views.get_notifications),
     path('notifications/mark-read/', views.mark_notifications_read),
+    path('notifications/unread-count/', views.get_unread_count),
+    path('events/', stream.event_stream, name='event-stream'),
+    path('events/ticket/', stream.stream_ticket, name='event-stream-ticket'),
     path('friends/remove/<int:friend_id>/', views.remove_friend),
+    path('leaderboard/', views.get_leaderboard),
+    path('leaderboard/me/', views.get_my_rank),
     path('google-auth/', views.google_auth, name='google-auth'),
 ] 
\ No newline at end of file
@@ -6,10 +6,19 @@ from django.contrib.auth import authenticate
 from rest_framework.authtoken.models import Token
 from .serializers import UserSerializer, UserRegistrationSerializer
 from .models import User, FriendRequest, Notification, Friendship
-from django.db.models import Q
+from .leaderboard import global_leaderboard
+from .suggestions import friend_suggestions
+from . import outbox, unread_counts
+from roster_royals.broadcast import broadcaster, user_channel
+from roster_royals.pagination import InvalidCursor, keyset_page, wants_page
+from django.db.models import Count, Exists, OuterRef, Q
+from django.db.models.functions import Length
 from google.oauth2 import id_token
 from google.auth.transport import requests
 from django.conf import settings
+from django.db import transaction
+
+SEARCH_LIMIT = 10
 
 class RegisterView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
@@ -80,11 +89,16 @@ def send_friend_request(request, user_id):
             )
             
         # Create the friend request
-        FriendRequest.objects.create(
+        friend_request = FriendRequest.objects.create(
             from_user=request.user,
             to_user=to_user,
             status='pending'
         )
+        broadcaster.publish(user_channel(to_user.id), {
+            'type': 'friend_request',
+            'request_id': friend_request.id,
+            'from_user': {'id': request.user.id, 'username': request.user.username},
+        })
         return Response({'message': 'Friend request sent'})
         
     except User.DoesNotExist:
@@ -125,20 +139,18 @@ def handle_friend_request(request, request_id):
         action = request.data.get('action')
         
         if action == 'accept':
-            # Update request status
-            friend_request.status = 'accepted'
-            friend_request.save()
-            
-            # Create friendship records in both directions
-            Friendship.objects.create(user=request.user, friend=friend_request.from_user)
-            Friendship.objects.create(user=friend_request.from_user, friend=request.user)
-            
-            # Create notification for sender
-            Notification.objects.create(
-                user=friend_request.from_user,
-                message=f"{request.user.username} accepted your friend request",
-                notification_type='friend_accepted'
-            )
+            with transaction.atomic():
+                # Update request status
+                friend_request.status = 'accepted'
+                friend_request.save()
+
+                # Create friendship records in both directions
+                Friendship.objects.create(user=request.user, friend=friend_request.from_user)
+                Friendship.objects.create(user=friend_request.from_user, friend=request.user)
+
+                # Notify the sender
+                outbox.record('friend_accepted', user_id=request.user.id, to_user_id=friend_request.from_user_id)
+            friend_suggestions.add_friendship(request.user.id, friend_request.from_user_id)
             
             return Response({'message': 'Friend request accepted'})
             
@@ -153,10 +165,32 @@ def handle_friend_request(request, request_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_friends(request):
-    # Get friends through the Friendship model
-    friendships = Friendship.objects.filter(user=request.user)
-    friends = [friendship.friend for friendship in friendships]
-    return Response(UserSerializer(friends, many=True).data)
+    # Get friends through the Friendship model, newest first
+    friendships = Friendship.objects.filter(user=request.user).select_related('friend')
+    next_cursor = None
+    if wants_page(request):
+        try:
+            friendships, next_cursor = keyset_page(friendships, request)
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=400)
+    else:
+        friendships = list(friendships.order_by('-created_at', '-id'))
+
+    friends = UserSerializer([friendship.friend for friendship in friendships], many=True).data
+    if request.GET.get('mutual') in ('1', 'true'):
+        # One aggregate over the friends' own friendships that are also mine
+        counts = dict(
+            Friendship.objects.filter(
+                user_id__in=[friend['id'] for friend in friends],
+                friend_id__in=Friendship.objects.filter(user=request.user).values('friend_id')
+            ).values('user_id').annotate(mutual=Count('id')).values_list('user_id', 'mutual')
+        )
+        for friend in friends:
+            friend['mutual_friends'] = counts.get(friend['id'], 0)
+
+    if wants_page(request):
+        return Response({'results': friends, 'next_cursor': next_cursor})
+    return Response(friends)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -164,52 +198,47 @@ def search_users(request):
     query = request.GET.get('q', '')
     if len(query) < 2:
         return Response([])
-    
+
     current_user = request.user
-    users = User.objects.filter(username__icontains=query)\
-        .exclude(id=current_user.id)\
+    # Friendship and request status come from EXISTS subqueries
+    users = User.objects.exclude(id=current_user.id)\
         .exclude(is_staff=True)\
-        .exclude(is_superuser=True)
-    
-    results = []
-    for user in users[:10]:  # Limit to 10 results
-        # Check friendship status
-        is_friend = current_user.friends.filter(id=user.id).exists()
-        pending_request = FriendRequest.objects.filter(
-            from_user=current_user,
-            to_user=user,
-            status='pending'
-        ).exists()
-        
-        results.append({
-            'id': user.id,
-            'username': user.username,
-            'points': user.points,
-            'friendStatus': 'friends' if is_friend else 'pending' if pending_request else 'none'
-        })
-    
-    return Response(results)
+        .exclude(is_superuser=True)\
+        .annotate(
+            is_friend=Exists(Friendship.objects.filter(user=current_user, friend=OuterRef('pk'))),
+            pending_request=Exists(FriendRequest.objects.filter(
+                from_user=current_user, to_user=OuterRef('pk'), status='pending'
+            )),
+        )\
+        .values('id', 'username', 'points', 'is_friend', 'pending_request')
+
+    # Prefix matches rank first, shorter names first, and are a range over the
+    # UPPER(username) prefix index. Substring matches fill the remaining slots
+    # in id order so the scan can stop as soon as they are full.
+    results = list(users.filter(username__istartswith=query).order_by(Length('username'), 'username')[:SEARCH_LIMIT])
+    if len(results) < SEARCH_LIMIT:
+        results += users.filter(username__icontains=query)\
+            .exclude(username__istartswith=query)\
+            .order_by('id')[:SEARCH_LIMIT - len(results)]
+
+    return Response([{
+        'id': user['id'],
+        'username': user['username'],
+        'points': user['points'],
+        'friendStatus': 'friends' if user['is_friend'] else 'pending' if user['pending_request'] else 'none'
+    } for user in results])
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_notifications(request):
-    print(f"\nGetting notifications for user: {request.user.username}")
     notifications = Notification.objects.filter(user=request.user)
-    print(f"Found {notifications.count()} notifications")
-    
-    # Debug: Print all notifications in detail
-    for n in notifications:
-        print(f"""
-        Notification details:
-        - ID: {n.id}
-        - Type: {n.notification_type}
-        - Message: {n.message}
-        - Is Read: {n.is_read}
-        - Requires Action: {n.requires_action}
-        - Reference ID: {n.reference_id}
-        - Created At: {n.created_at}
-        """)
-    
+    next_cursor = None
+    if wants_page(request):
+        try:
+            notifications, next_cursor = keyset_page(notifications, request)
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=400)
+
     response_data = [{
         'id': n.id,
         'message': n.message,
@@ -219,9 +248,20 @@ def get_notifications(request):
         'requires_action': n.requires_action,
         'reference_id': n.reference_id
     } for n in notifications]
-    
+
+    if wants_page(request):
+        return Response({'results': response_data, 'next_cursor': next_cursor})
     return Response(response_data)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_unread_count(request):
+    count = unread_counts.get(request.user.id)
+    if count is None:
+        count = Notification.objects.filter(user=request.user, is_read=False).count()
+        unread_counts.fill(request.user.id, count)
+    return Response({'unread': count})
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def mark_notifications_read(request):
@@ -233,6 +273,7 @@ def mark_notifications_read(request):
     
     # Mark all as read
     notifications.update(is_read=True)
+    unread_counts.reset(request.user.id)
     
     # Delete non-actionable notifications that are read
     Notification.objects.filter(
@@ -263,6 +304,7 @@ def remove_friend(request, friend_id):
         
         # Clear from ManyToMany field (this should happen automatically due to through model)
         request.user.friends.remove(friend)
+        friend_suggestions.remove_friendship(request.user.id, friend.id)
         
         return Response({'message': 'Friend removed successfully'})
     except User.DoesNotExist:
@@ -328,4 +370,51 @@ def google_auth(request):
         return Response({
             'error': 'Authentication failed',
             'details': str(e)
-        }, status=500) 
\ No newline at end of file
+        }, status=500) 
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_leaderboard(request):
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 0), 100)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=400)
+    return Response(global_leaderboard.top(limit))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_friend_suggestions(request):
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 50)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=400)
+
+    # Skip anyone with a pending request either way
+    pending = FriendRequest.objects.filter(
+        Q(from_user=request.user) | Q(to_user=request.user), status='pending'
+    ).values_list('from_user_id', 'to_user_id')
+    exclude = {user_id for pair in pending for user_id in pair}
+    # Over-fetch a little since staff and inactive users are filtered below
+    suggestions = friend_suggestions.suggest(request.user.id, limit * 2, exclude)
+    users = User.objects.filter(
+        id__in=[user_id for user_id, *_ in suggestions], is_active=True, is_staff=False, is_superuser=False
+    ).in_bulk()
+    return Response([
+        {
+            'id': user_id,
+            'username': users[user_id].username,
+            'mutual_friends': mutual,
+            'shared_groups': shared,
+        }
+        for user_id, score, mutual, shared in suggestions if user_id in users
+    ][:limit])
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_my_rank(request):
+    try:
+        window = min(max(int(request.GET.get('window', 5)), 0), 50)
+    except ValueError:
+        return Response({'error': 'window must be an integer'}, status=400)
+    rank, around = global_leaderboard.around(request.user.id, window)
+    return Response({'rank': rank, 'around': around})